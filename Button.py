@@ -1,17 +1,18 @@
 import pygame
+from renderer import get_renderer
 
 
 class Button:
     """
     The Button class represents a clickable button in the game.
-    It has methods for drawing the button and checking if it has been clicked.
+    It has methods for drawing the button and checking if an event clicks it.
     """
 
     def __init__(self, x, y, image, scale):
         """
         This method initializes a Button object.
         It scales the image to the given scale and sets the button's rect to be centered at the given coordinates.
-        It also sets the clicked attribute to False and gets the display surface.
+        It also gets the renderer's surface.
 
         :param x: The x-coordinate of the center of the button.
         :param y: The y-coordinate of the center of the button.
@@ -24,24 +25,19 @@ class Button:
                                                     int(height * scale)))
         self.rect = self.image.get_rect()
         self.rect.center = (x, y)
-        self.clicked = False
-        self.screen = pygame.display.get_surface()
+        self.screen = get_renderer().surface
 
     def draw(self):
         """
-        This method draws the button on the screen and checks if it has been clicked.
-        :return: True if the button is clicked, False otherwise.
+        This method draws the button on the screen. Clicks are checked with is_clicked.
         """
-        action = False
-        # get mouse position
-        pos = pygame.mouse.get_pos()
-        # check mouseover and clicked conditions
-        if self.rect.collidepoint(pos):
-            if pygame.mouse.get_pressed()[0] and self.clicked is False:
-                self.clicked = True
-                action = True
-        if pygame.mouse.get_pressed()[0] == 0:
-            self.clicked = False
-
         self.screen.blit(self.image, (self.rect.x, self.rect.y))
-        return action
+
+    def is_clicked(self, event):
+        """
+        This method checks if an event is a left click on the button.
+
+        :param event: The event to check.
+        :return: True if the button is clicked, False otherwise.
+        """
+        return event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 and self.rect.collidepoint(event.pos)
@@ -1,20 +1,24 @@
 import pygame
-import settings
 from settings import *
+from renderer import get_renderer
+from drawlist import DrawList
 
 
 class UI:
     """
     The UI class represents the user interface in the game.
     It displays the player's health, the current level, and the number of enemies.
+    The boxes are drawn right away and the texts are queued on a draw list submitted once they are all drawn.
     """
 
     def __init__(self):
         """
-        This method initializes a UI object. It gets the display surface, sets the font, and sets up the health bar.
+        This method initializes a UI object. It gets the HUD surface, sets the font, and sets up the draw list
+        and the health bar.
         """
-        # get the display surface
-        self.display_surface = pygame.display.get_surface()
+        # get the HUD surface
+        self.display_surface = get_renderer().surface
+        self.draw_list = DrawList()
         self.font = pygame.font.Font(UI_FONT, UI_FONT_SIZE)
 
         # health bar setup
@@ -43,7 +47,7 @@ class UI:
 
     def show_level(self, level):
         """
-        This method displays the current level. It renders the level text and draws it on the display surface.
+        This method displays the current level. It renders the level text, draws its box and queues the text.
 
         :param level: The current level.
         """
@@ -52,11 +56,11 @@ class UI:
 
         pygame.draw.rect(self.display_surface, UI_BG_COLOR, text_rect.inflate(10, 10))
         pygame.draw.rect(self.display_surface, 'black', text_rect.inflate(10, 10), 3)
-        self.display_surface.blit(text_surface, text_rect)
+        self.draw_list.add(text_surface, text_rect.topleft)
 
     def show_enemies(self, enemies):
         """
-        This method displays the number of enemies. It renders the enemies text and draws it on the display surface.
+        This method displays the number of enemies. It renders the enemies text, draws its box and queues the text.
 
         :param enemies: The number of enemies.
         """
@@ -65,14 +69,28 @@ class UI:
 
         pygame.draw.rect(self.display_surface, UI_BG_COLOR, text_rect.inflate(10, 10))
         pygame.draw.rect(self.display_surface, 'black', text_rect.inflate(10, 10), 3)
+        self.draw_list.add(text_surface, text_rect.topleft)
+
+    def show_paused(self):
+        """
+        This method displays the pause text in the middle of the display surface.
+        """
+        text_surface = self.font.render('PAUSED', False, UI_TEXT_COLOR)
+        text_rect = text_surface.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+
+        pygame.draw.rect(self.display_surface, UI_BG_COLOR, text_rect.inflate(20, 20))
+        pygame.draw.rect(self.display_surface, UI_BORDER_COLOR, text_rect.inflate(20, 20), 3)
         self.display_surface.blit(text_surface, text_rect)
 
-    def draw(self, player):
+    def draw(self, player, waves):
         """
-        This method draws the UI. It displays the player's health, the current level, and the number of enemies.
+        This method draws the UI. It displays the player's health, the current level, and the number of enemies,
+        then submits the queued texts.
 
         :param player: The player object.
+        :param waves: The WaveManager of the level.
         """
         self.show_health(player.health, player.stats['health'], self.health_bar, HEALTH_COLOR)
-        self.show_level(settings.LEVEL)
-        self.show_enemies(len(settings.enemies))
+        self.show_level(waves.level)
+        self.show_enemies(waves.total_alive)
+        self.draw_list.submit(self.display_surface)
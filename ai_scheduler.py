@@ -0,0 +1,58 @@
+import pygame
+from settings import *
+
+
+class AIScheduler:
+    """
+    The AIScheduler class decides which enemies run their AI each frame.
+    Enemies on screen or near the player think every frame. Far enemies take turns: a cursor into the list
+    of far enemies moves forward by `budget` every frame and wraps around, and only the far enemies from the cursor on
+    think, so at most `budget` far enemies are updated per frame and every far enemy is reached in turn.
+    Between their updates, far enemies keep moving in the last direction they chose.
+
+    :param near_radius: The distance from the player within which enemies always think.
+    :param budget: The maximum number of far enemies updated per frame.
+    """
+
+    def __init__(self, near_radius=AI_NEAR_RADIUS, budget=AI_FAR_BUDGET):
+        """
+        This method initializes an AIScheduler object. It sets up the near radius, the budget,
+        the view rectangle, and the cursor into the far enemies.
+
+        :param near_radius: The distance from the player within which enemies always think.
+        :param budget: The maximum number of far enemies updated per frame.
+        """
+        self.near_radius = near_radius
+        self.budget = budget
+        self.view_rect = pygame.Rect(0, 0, WIDTH, HEIGHT).inflate(AI_VIEW_MARGIN * 2, AI_VIEW_MARGIN * 2)
+        self.cursor = 0
+
+    def update(self, enemies, player):
+        """
+        This method runs the AI of the near enemies and of at most `budget` far enemies, from the cursor on.
+
+        :param enemies: The enemies.
+        :param player: The player object.
+        """
+        self.view_rect.center = player.rect.center
+        player_x, player_y = player.rect.center
+        near_distance = self.near_radius * self.near_radius
+
+        far_enemies = []
+        for enemy in enemies:
+            enemy_x, enemy_y = enemy.rect.center
+            distance = (enemy_x - player_x) ** 2 + (enemy_y - player_y) ** 2
+            if distance <= near_distance or self.view_rect.colliderect(enemy.rect):
+                enemy.enemy_update(player)
+            else:
+                far_enemies.append(enemy)
+
+        if far_enemies:
+            if self.cursor >= len(far_enemies):
+                self.cursor = 0
+            due = far_enemies[self.cursor:self.cursor + self.budget]
+            if len(due) < self.budget:
+                due += far_enemies[:min(self.budget - len(due), self.cursor)]
+            for enemy in due:
+                enemy.enemy_update(player)
+            self.cursor = (self.cursor + self.budget) % len(far_enemies)
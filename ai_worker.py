@@ -0,0 +1,287 @@
+from math import hypot
+import multiprocessing
+from multiprocessing import shared_memory
+import weakref
+import numpy as np
+import pygame
+from settings import *
+from collision import CollisionGrid
+from world import MapLayer
+
+INPUT_FIELDS = 12  # hitbox x, y, width, height, hitbox offset, direction, speed, resistance, attack radius, vulnerable
+OUTPUT_FIELDS = 5  # hitbox x, y, direction x, y, attacking
+STATUSES = ('move', 'attack')
+
+
+def buffers(buffer, capacity):
+    """
+    This function maps the input and output arrays on a shared memory block. Both arrays have two buffers,
+    one for each parity of the frame, of one row per enemy.
+
+    :param buffer: The buffer of the shared memory block.
+    :param capacity: The maximum number of enemies in a buffer.
+    :return: The input and output arrays.
+    """
+    inputs = np.ndarray((2, capacity, INPUT_FIELDS), dtype=np.float32, buffer=buffer)
+    outputs = np.ndarray((2, capacity, OUTPUT_FIELDS), dtype=np.float32, buffer=buffer, offset=inputs.nbytes)
+    return inputs, outputs
+
+
+class Obstacle:
+    """
+    The Obstacle class stands in for a boundary or object tile in the worker: it only has the hitbox of the tile.
+
+    :param pos: The position of the top left corner of the tile.
+    :param size: The size of the tile's image.
+    """
+
+    __slots__ = ('hitbox',)
+
+    def __init__(self, pos, size):
+        """
+        This method initializes an Obstacle object with the hitbox a Tile of that position and size has.
+
+        :param pos: The position of the top left corner of the tile.
+        :param size: The size of the tile's image.
+        """
+        self.hitbox = pygame.Rect(pos, size).inflate(0, -10)
+
+
+class ObstacleMirror:
+    """
+    The ObstacleMirror class keeps a collision grid in the worker with the obstacles of the chunks resident
+    in the main process, so the enemies collide with the same obstacles whichever process steers them.
+    The obstacles of a chunk are read from the boundary and object layers when it becomes resident.
+
+    :param object_sizes: The sizes of the object images, in the order of their indices in the object layer.
+    :param chunk_size: The width and height of a chunk in tiles.
+    """
+
+    def __init__(self, object_sizes, chunk_size=CHUNK_SIZE):
+        """
+        This method initializes an ObstacleMirror object with no resident chunk.
+
+        :param object_sizes: The sizes of the object images, in the order of their indices in the object layer.
+        :param chunk_size: The width and height of a chunk in tiles.
+        """
+        self.object_sizes = object_sizes
+        self.chunk_size = chunk_size
+        self.boundary = MapLayer('map/map2_FloorBlocks.csv')
+        self.objects = MapLayer('map/map2_Objects.csv')
+        self.grid = CollisionGrid()
+        self.resident = {}  # chunk -> obstacles
+
+    def sync(self, chunks):
+        """
+        This method makes the resident chunks those of the main process, adding and removing obstacles.
+
+        :param chunks: The resident chunks of the main process.
+        """
+        for chunk in [chunk for chunk in self.resident if chunk not in chunks]:
+            for obstacle in self.resident.pop(chunk):
+                self.grid.remove(obstacle)
+        for chunk in chunks:
+            if chunk not in self.resident:
+                obstacles = [Obstacle(pos, (TILESIZE, TILESIZE))
+                             for pos, _ in self.boundary.cells(chunk, self.chunk_size)]
+                obstacles += [Obstacle(pos, self.object_sizes[int(column)])
+                              for pos, column in self.objects.cells(chunk, self.chunk_size)]
+                for obstacle in obstacles:
+                    self.grid.add(obstacle)
+                self.resident[chunk] = obstacles
+
+
+def steer(inputs, outputs, player_x, player_y, obstacles):
+    """
+    This function moves the enemies of a frame and runs their AI, like Enemy.update followed by Enemy.enemy_update:
+    a hit enemy is knocked back, every enemy moves through the obstacles, then attacks the player if it is
+    within its attack radius, or else turns towards the player.
+
+    :param inputs: The input rows of the enemies.
+    :param outputs: The output rows to write, one per input row.
+    :param player_x: The x-coordinate of the center of the player's rect.
+    :param player_y: The y-coordinate of the center of the player's rect.
+    :param obstacles: The collision grid.
+    """
+    hitbox = pygame.Rect(0, 0, 0, 0)
+    for index, row in enumerate(inputs.tolist()):
+        x, y, width, height, offset_x, offset_y, direction_x, direction_y, speed, resistance, radius, vulnerable = row
+
+        # hit reaction and movement
+        if not vulnerable:
+            direction_x *= -resistance
+            direction_y *= -resistance
+        length = hypot(direction_x, direction_y)
+        if length:
+            direction_x /= length
+            direction_y /= length
+        hitbox.update(int(x), int(y), int(width), int(height))
+        obstacles.move_x(hitbox, direction_x * speed)
+        obstacles.move_y(hitbox, direction_y * speed)
+
+        # AI
+        to_x = player_x - (hitbox.centerx - offset_x)
+        to_y = player_y - (hitbox.centery - offset_y)
+        distance = hypot(to_x, to_y)
+        attacking = distance <= radius
+        if not attacking:
+            direction_x, direction_y = (to_x / distance, to_y / distance) if distance else (0, 0)
+        outputs[index] = (hitbox.x, hitbox.y, direction_x, direction_y, attacking)
+
+
+def ai_worker(connection, name, capacity, object_sizes):
+    """
+    This function runs the enemy AI in a worker process. It steers the enemies of every job it is sent,
+    in the buffers of the job, against the obstacles of the resident chunks of the job, until it is told to close.
+
+    :param connection: The worker's end of the pipe.
+    :param name: The name of the shared memory block.
+    :param capacity: The maximum number of enemies in a buffer.
+    :param object_sizes: The sizes of the object images, in the order of their indices in the object layer.
+    """
+    block = shared_memory.SharedMemory(name=name)
+    inputs, outputs = buffers(block.buf, capacity)
+    try:
+        obstacles = ObstacleMirror(object_sizes)
+        connection.send('ready')
+        while True:
+            command, data = connection.recv()
+            if command == 'steer':
+                index, count, player_x, player_y, chunks = data
+                if chunks is not None:
+                    obstacles.sync(chunks)
+                steer(inputs[index, :count], outputs[index, :count], player_x, player_y, obstacles.grid)
+                connection.send(index)
+            elif command == 'close':
+                break
+    except (OSError, EOFError):
+        pass  # the main process stopped without closing the worker
+    del inputs, outputs
+    block.close()
+    connection.close()
+
+
+def shutdown(connection, worker, block):
+    """
+    This function stops a worker process and frees its shared memory block.
+
+    :param connection: The main process' end of the pipe.
+    :param worker: The worker process.
+    :param block: The shared memory block.
+    """
+    try:
+        connection.send(('close', None))
+    except (OSError, EOFError):
+        pass
+    connection.close()
+    worker.join(AI_WORKER_TIMEOUT)
+    if worker.is_alive():
+        worker.terminate()
+    block.close()
+    block.unlink()
+
+
+class AIWorker:
+    """
+    The AIWorker class moves the enemies and runs their AI in a worker process, for waves too large
+    for the main process. The state of the enemies is passed in a shared memory block instead of being pickled.
+    At the end of a frame the state of the enemies is written in the buffer of the next frame and the worker
+    steers them while the main process draws; the results are applied at the start of the next frame.
+    The buffers are double buffered by frame parity, so the worker never writes the buffer of the frame
+    whose results are being applied.
+
+    The worker resolves the movement against the obstacles of the chunks resident in the main process when the job
+    was sent, and all of its enemies think every frame. The enemies it did not steer, those spawned since the last job
+    or beyond its capacity, are updated in the main process.
+    Every failure of the worker raises OSError or EOFError, and the caller falls back to updating the enemies
+    in the main process.
+
+    :param object_sizes: The sizes of the object images, in the order of their indices in the object layer.
+    :param capacity: The maximum number of enemies steered by the worker.
+    """
+
+    def __init__(self, object_sizes, capacity=AI_WORKER_CAPACITY):
+        """
+        This method initializes an AIWorker object. It creates the shared memory block and starts the worker
+        process, which is spawned rather than forked, so it does not inherit the threads of the asset preloader.
+        The worker starts in the background, jobs are only sent once it is ready.
+
+        :param object_sizes: The sizes of the object images, in the order of their indices in the object layer.
+        :param capacity: The maximum number of enemies steered by the worker.
+        """
+        self.capacity = capacity
+        self.block = shared_memory.SharedMemory(
+            create=True, size=2 * capacity * (INPUT_FIELDS + OUTPUT_FIELDS) * np.dtype(np.float32).itemsize)
+        self.inputs, self.outputs = buffers(self.block.buf, capacity)
+
+        context = multiprocessing.get_context('spawn')
+        self.connection, worker_connection = context.Pipe()
+        self.worker = context.Process(target=ai_worker, daemon=True,
+                                      args=(worker_connection, self.block.name, capacity, object_sizes))
+        self.worker.start()
+        worker_connection.close()
+        # a backstop in case the worker is not closed, the level closes it when the game ends
+        self.finalizer = weakref.finalize(self, shutdown, self.connection, self.worker, self.block)
+
+        self.ready = False
+        self.frame = 0
+        self.job = None  # the enemies of the job sent to the worker, in the order of its rows
+        self.chunks = None  # the resident chunks last sent to the worker
+
+    def publish(self, enemies, player, chunks):
+        """
+        This method writes the state of the enemies in the buffer of the next frame and sends the job
+        to the worker, with the resident chunks if they changed since the last job.
+        Nothing is sent until the worker is ready.
+
+        :param enemies: The enemies.
+        :param player: The player.
+        :param chunks: The resident chunks.
+        """
+        if not self.ready:
+            if not self.connection.poll():
+                return
+            self.ready = self.connection.recv() == 'ready'
+
+        self.frame += 1
+        index = self.frame % 2
+        job = enemies.sprites()[:self.capacity]
+        if job:
+            self.inputs[index, :len(job)] = [
+                (*enemy.hitbox, *enemy.hitbox_offset, enemy.direction.x, enemy.direction.y,
+                 enemy.speed, enemy.resistance, enemy.attack_radius, enemy.vulnerable) for enemy in job]
+        chunks = frozenset(chunks)
+        self.connection.send(('steer', (index, len(job), *player.rect.center,
+                                        None if chunks == self.chunks else chunks)))
+        self.job = job
+        self.chunks = chunks
+
+    def collect(self, enemies):
+        """
+        This method waits for the results of the job and applies them to the enemies of the job still alive.
+
+        :param enemies: The enemies.
+        :return: The enemies the worker did not steer.
+        """
+        job = self.job
+        if job is None:
+            return enemies.sprites()
+        self.job = None
+        if not self.connection.poll(AI_WORKER_TIMEOUT):
+            raise TimeoutError('the AI worker did not answer')
+        index = self.connection.recv()
+
+        steered = set()
+        for enemy, (x, y, direction_x, direction_y, attacking) in zip(job, self.outputs[index, :len(job)].tolist()):
+            if enemy.alive():
+                enemy.apply_steering(int(x), int(y), direction_x, direction_y, STATUSES[int(attacking)])
+                steered.add(enemy)
+        return [enemy for enemy in enemies if enemy not in steered]
+
+    def close(self):
+        """
+        This method stops the worker process and frees the shared memory block.
+        """
+        self.job = None
+        del self.inputs, self.outputs
+        self.finalizer()
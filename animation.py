@@ -0,0 +1,81 @@
+from support import import_folder
+
+
+class AnimationClock:
+    """
+    The AnimationClock class drives shared animations from a single frame counter.
+    Every animation folder is loaded once into an AnimationTrack, and all sprites that play that folder
+    share the track. Advancing the clock computes one frame index per track, no matter how many sprites use it.
+
+    :param animation_speed: The number of animation frames advanced per game frame.
+    """
+
+    def __init__(self, animation_speed=0.15):
+        """
+        This method initializes an AnimationClock object. It sets up the animation speed, the elapsed animation time,
+        and the dictionary of tracks.
+
+        :param animation_speed: The number of animation frames advanced per game frame.
+        """
+        self.animation_speed = animation_speed
+        self.time = 0
+        self.tracks = {}
+
+    def track(self, path):
+        """
+        This method gets the track for an animation folder. The folder is imported the first time it is requested,
+        afterwards the same track is returned to every caller.
+
+        :param path: The path to the folder containing the animation frames.
+        :return: The AnimationTrack playing the folder.
+        """
+        if path not in self.tracks:
+            track = AnimationTrack(import_folder(path))
+            track.advance(int(self.time))
+            self.tracks[path] = track
+        return self.tracks[path]
+
+    def tick(self):
+        """
+        This method advances the clock by one game frame and updates the frame index of every track.
+        """
+        self.time += self.animation_speed
+        step = int(self.time)
+        for track in self.tracks.values():
+            track.advance(step)
+
+
+class AnimationTrack:
+    """
+    The AnimationTrack class represents one animation shared by many sprites.
+    It holds the frames and the frame index computed by the AnimationClock.
+
+    :param frames: The list of surfaces making up the animation.
+    """
+
+    def __init__(self, frames):
+        """
+        This method initializes an AnimationTrack object. It sets up the frames and the current frame index.
+
+        :param frames: The list of surfaces making up the animation.
+        """
+        self.frames = frames
+        self.length = len(frames)
+        self.index = 0
+
+    def advance(self, step):
+        """
+        This method sets the current frame index from the clock's step count.
+
+        :param step: The number of whole animation frames the clock has advanced.
+        """
+        self.index = step % self.length
+
+    def frame(self, phase=0):
+        """
+        This method gets the current frame of the animation.
+
+        :param phase: The per-sprite offset in frames, so sprites sharing a track don't move in lockstep.
+        :return: The surface of the current frame.
+        """
+        return self.frames[(self.index + phase) % self.length]
@@ -0,0 +1,180 @@
+from concurrent.futures import ThreadPoolExecutor
+from os import walk
+from os.path import exists
+import pygame
+from settings import MUSIC, FLOOR_TILESET
+
+# folders whose images are preloaded with per-pixel alpha
+IMAGE_FOLDERS = ['graphics/player', 'graphics/enemies', 'graphics/Objects', 'graphics/Food', 'graphics/weapons']
+# single images without transparency
+OPAQUE_IMAGES = [FLOOR_TILESET]
+SOUND_FOLDER = 'sounds'
+
+
+def collect_assets():
+    """
+    This function collects the paths of every asset the level needs.
+
+    :return: A list of (path, alpha) pairs for the images and a list of paths for the sounds.
+    """
+    images = [(path, False) for path in OPAQUE_IMAGES if exists(path)]  # a missing tileset is built by the level
+    for folder in IMAGE_FOLDERS:
+        for root, __, img_files in walk(folder):
+            for image in img_files:
+                images.append((root + '/' + image, True))
+
+    sounds = []
+    for _, __, sound_files in walk(SOUND_FOLDER):
+        for sound in sound_files:
+            if SOUND_FOLDER + '/' + sound != MUSIC:  # the music is streamed, not decoded
+                sounds.append(SOUND_FOLDER + '/' + sound)
+    return images, sounds
+
+
+class AssetPreloader:
+    """
+    The AssetPreloader class loads images and sounds in the background.
+    Files are read and decoded on a thread pool, while the conversion of images to the display format,
+    which needs the display, is done on the main thread by poll. Every asset is cached, so the level
+    gets already decoded surfaces and sounds when it is created.
+
+    :param max_workers: The number of threads decoding assets.
+    """
+
+    def __init__(self, max_workers=4):
+        """
+        This method initializes an AssetPreloader object. It sets up the caches and the pending loads.
+
+        :param max_workers: The number of threads decoding assets.
+        """
+        self.max_workers = max_workers
+        self.executor = None
+        self.pending = {}
+        self.images = {}
+        self.sounds = {}
+        self.total = 0
+        self.finished = 0
+
+    def start(self, images, sounds):
+        """
+        This method starts decoding the given assets on the thread pool.
+
+        :param images: A list of (path, alpha) pairs, alpha tells if the image is converted with per-pixel alpha.
+        :param sounds: A list of paths to the sounds.
+        """
+        self.executor = ThreadPoolExecutor(self.max_workers)
+        for path, alpha in images:
+            if path not in self.images and path not in self.pending:
+                self.pending[path] = ('image', alpha, self.executor.submit(pygame.image.load, path))
+                self.total += 1
+        for path in sounds:
+            if path not in self.sounds and path not in self.pending:
+                self.pending[path] = ('sound', None, self.executor.submit(pygame.mixer.Sound, path))
+                self.total += 1
+
+    @property
+    def progress(self):
+        """
+        This property gets the share of the started assets that are ready.
+
+        :return: A number between 0 and 1.
+        """
+        if self.total == 0:
+            return 1
+        return self.finished / self.total
+
+    @property
+    def done(self):
+        """
+        This property tells if every started asset is ready.
+
+        :return: True if nothing is pending, False otherwise.
+        """
+        return not self.pending
+
+    def poll(self):
+        """
+        This method stores every asset that finished decoding, converting images to the display format.
+        It has to be called from the main thread.
+
+        :return: The loading progress.
+        """
+        for path, (kind, alpha, future) in list(self.pending.items()):
+            if future.done():
+                self.store(path, kind, alpha, future)
+
+        if self.done and self.executor:
+            self.executor.shutdown(wait=False)
+            self.executor = None
+        return self.progress
+
+    def store(self, path, kind, alpha, future):
+        """
+        This method moves a finished load from the pending loads to the caches.
+        Loads that failed are dropped, so requesting the asset loads it again and raises the error there.
+
+        :param path: The path to the asset.
+        :param kind: The kind of the asset ('image' or 'sound').
+        :param alpha: Whether the image is converted with per-pixel alpha.
+        :param future: The future of the load.
+        """
+        del self.pending[path]
+        self.finished += 1
+        if future.exception() is not None:
+            return
+        if kind == 'image':
+            self.images[path] = self.convert(future.result(), alpha)
+        else:
+            self.sounds[path] = future.result()
+
+    @staticmethod
+    def convert(surface, alpha):
+        """
+        This method converts a decoded image to the display format.
+        Without a display, as in headless simulations, the image is kept as decoded.
+
+        :param surface: The decoded image.
+        :param alpha: Whether the image keeps per-pixel alpha.
+        :return: The converted surface.
+        """
+        if pygame.display.get_surface() is None:
+            return surface
+        return surface.convert_alpha() if alpha else surface.convert()
+
+    def image(self, path, alpha=True):
+        """
+        This method gets an image. If it is still decoding, it waits for it; if it was never started,
+        it loads it right away.
+
+        :param path: The path to the image.
+        :param alpha: Whether the image is converted with per-pixel alpha.
+        :return: The converted surface.
+        """
+        if path not in self.images:
+            if path in self.pending:
+                kind, alpha, future = self.pending[path]
+                future.result()
+                self.store(path, kind, alpha, future)
+            else:
+                self.images[path] = self.convert(pygame.image.load(path), alpha)
+        return self.images[path]
+
+    def sound(self, path):
+        """
+        This method gets a sound. If it is still decoding, it waits for it; if it was never started,
+        it loads it right away.
+
+        :param path: The path to the sound.
+        :return: The sound.
+        """
+        if path not in self.sounds:
+            if path in self.pending:
+                kind, alpha, future = self.pending[path]
+                future.result()
+                self.store(path, kind, alpha, future)
+            else:
+                self.sounds[path] = pygame.mixer.Sound(path)
+        return self.sounds[path]
+
+
+preloader = AssetPreloader()
@@ -0,0 +1,100 @@
+import pygame
+from settings import *
+from assets import preloader
+
+
+class AudioManager:
+    """
+    The AudioManager class plays the game's music and sound effects.
+    The music is streamed from disk through the mixer's music API instead of being decoded into memory.
+    Sound effects are played by name, at most once per frame and with a limit on how many copies of a sound
+    can play at the same time. Important sounds play on reserved channels, so they are never drowned out
+    by a crowd of enemy sounds.
+    A disabled AudioManager, used by headless levels, never touches the mixer and plays nothing.
+
+    :param reserved_channels: The number of mixer channels kept for important sounds.
+    :param enabled: Whether sounds and music are played.
+    """
+
+    def __init__(self, reserved_channels=RESERVED_CHANNELS, enabled=True):
+        """
+        This method initializes an AudioManager object. It reserves the mixer channels and registers
+        every sound from the sound data.
+
+        :param reserved_channels: The number of mixer channels kept for important sounds.
+        :param enabled: Whether sounds and music are played.
+        """
+        self.enabled = enabled
+        self.sounds = {}
+        self.played = set()
+        self.reserved_channels = []
+        if not enabled:
+            return
+
+        pygame.mixer.set_reserved(reserved_channels)
+        self.reserved_channels = [pygame.mixer.Channel(index) for index in range(reserved_channels)]
+        for name, info in sound_data.items():
+            self.register(name, info['path'], info['volume'], info['voices'], info['reserved'])
+
+    def register(self, name, path, volume, voices=1, reserved=False):
+        """
+        This method registers a sound effect.
+
+        :param name: The name used to play the sound.
+        :param path: The path to the sound file.
+        :param volume: The volume of the sound.
+        :param voices: The maximum number of copies of the sound playing at the same time.
+        :param reserved: Whether the sound plays on the reserved channels.
+        """
+        sound = preloader.sound(path)
+        sound.set_volume(volume)
+        self.sounds[name] = (sound, voices, reserved)
+
+    def play(self, name):
+        """
+        This method plays a sound effect. The sound is skipped if it was already played this frame
+        or if all of its voices are busy.
+
+        :param name: The name of the sound.
+        """
+        if not self.enabled or name in self.played:
+            return
+        sound, voices, reserved = self.sounds[name]
+        if sound.get_num_channels() >= voices:
+            return
+        self.played.add(name)
+
+        if reserved:
+            for channel in self.reserved_channels:
+                if not channel.get_busy():
+                    channel.play(sound)
+                    return
+            self.reserved_channels[0].play(sound)
+        else:
+            sound.play()  # only uses the channels that are not reserved, skipped when they are all busy
+
+    def end_frame(self):
+        """
+        This method ends the current frame, allowing every sound to be played again.
+        """
+        self.played.clear()
+
+    def play_music(self, path=MUSIC, volume=MUSIC_VOLUME):
+        """
+        This method streams music from disk in a loop.
+
+        :param path: The path to the music file.
+        :param volume: The volume of the music.
+        """
+        if not self.enabled:
+            return
+        pygame.mixer.music.load(path)
+        pygame.mixer.music.set_volume(volume)
+        pygame.mixer.music.play(loops=-1)
+
+    def stop_music(self):
+        """
+        This method stops the music.
+        """
+        if self.enabled:
+            pygame.mixer.music.stop()
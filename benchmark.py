@@ -0,0 +1,133 @@
+import argparse
+import subprocess
+import sys
+import time
+from operator import attrgetter
+from random import randint, choice
+import pygame
+from settings import *
+from renderer import create_renderer
+from support import import_folder
+from drawlist import DrawList
+
+BACKENDS = ['surface', 'texture']
+
+
+def blit_throughput(kind, sprites, frames):
+    """
+    This function measures how fast a renderer draws sprites. Every frame, it draws the given number of
+    enemy frames at random positions and presents the result.
+
+    :param kind: The renderer to measure ('surface' or 'texture').
+    :param sprites: The number of sprites drawn per frame.
+    :param frames: The number of frames measured.
+    :return: The renderer used, which differs from the requested one after a fallback,
+             the blits per second and the milliseconds per frame.
+    """
+    pygame.init()
+    renderer = create_renderer(kind)
+    images = []
+    for name in enemy_data:
+        images += import_folder(f'graphics/enemies/{name}/move')
+    positions = [(randint(0, WIDTH - 64), randint(0, HEIGHT - 64)) for _ in range(sprites)]
+    images = [choice(images) for _ in range(sprites)]
+
+    # warm up, so the texture renderer uploads every image before measuring
+    renderer.begin_frame()
+    for image, pos in zip(images, positions):
+        renderer.blit(image, pos)
+    renderer.present()
+
+    start = time.perf_counter()
+    for _ in range(frames):
+        pygame.event.pump()
+        renderer.begin_frame()
+        for image, pos in zip(images, positions):
+            renderer.blit(image, pos)
+        renderer.present()
+    elapsed = time.perf_counter() - start
+
+    name = renderer.name
+    if name == 'texture' and not renderer.accelerated:
+        name = 'texture (software fallback)'
+    return name, sprites * frames / elapsed, elapsed * 1000 / frames
+
+
+def camera_cost(sprites, frames):
+    """
+    This function compares the per-frame cost of the two ways the camera can draw y-sorted sprites on the surface
+    renderer: one blit per sprite with a Vector2 offset, and integer positions queued on a draw list
+    submitted with a single blits call.
+
+    :param sprites: The number of sprites drawn per frame.
+    :param frames: The number of frames measured for each way.
+    :return: The milliseconds per frame of the per-sprite blits and of the draw list.
+    """
+    pygame.init()
+    renderer = create_renderer('surface')
+    images = []
+    for name in enemy_data:
+        images += import_folder(f'graphics/enemies/{name}/move')
+    group = pygame.sprite.Group()
+    for _ in range(sprites):
+        sprite = pygame.sprite.Sprite(group)
+        sprite.image = choice(images)
+        sprite.rect = sprite.image.get_rect(topleft=(randint(0, WIDTH * 2), randint(0, HEIGHT * 2)))
+    offset = pygame.math.Vector2(WIDTH // 2, HEIGHT // 2)
+    surface = renderer.surface
+    draw_list = DrawList()
+
+    def per_sprite_blits():
+        for sprite in sorted(group.sprites(), key=lambda sprite: sprite.rect.centery):
+            offset_pos = sprite.rect.topleft - offset
+            surface.blit(sprite.image, offset_pos)
+
+    def batched_blits():
+        offset_x, offset_y = int(offset.x), int(offset.y)
+        draw_list.extend([(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+                          for sprite in sorted(group.sprites(), key=attrgetter('rect.centery'))])
+        draw_list.submit(surface)
+
+    # the two ways take turns every frame, so both see the same machine load
+    draws = (per_sprite_blits, batched_blits)
+    elapsed = [0, 0]
+    for _ in range(frames):
+        for index, draw in enumerate(draws):
+            pygame.event.pump()
+            renderer.begin_frame()
+            start = time.perf_counter()
+            draw()
+            elapsed[index] += time.perf_counter() - start
+    return tuple(total * 1000 / frames for total in elapsed)
+
+
+def main():
+    """
+    This function runs the benchmark. Every backend is measured in its own process, so each one gets a fresh window.
+    With --camera, the camera's per-sprite blits are compared with its draw list instead.
+    """
+    parser = argparse.ArgumentParser(description='Measure the blit throughput of the renderers and the camera.')
+    parser.add_argument('--backend', choices=BACKENDS + ['all'], default='all')
+    parser.add_argument('--sprites', type=int, default=2000)
+    parser.add_argument('--frames', type=int, default=120)
+    parser.add_argument('--camera', action='store_true', help='compare per-sprite blits with a draw list')
+    args = parser.parse_args()
+
+    if args.camera:
+        blit_time, draw_list_time = camera_cost(args.sprites, args.frames)
+        print(f'per-sprite blits: {blit_time:.2f} ms, draw list: {draw_list_time:.2f} ms '
+              f'per frame of {args.sprites} sprites')
+        return
+
+    if args.backend == 'all':
+        for backend in BACKENDS:
+            subprocess.run([sys.executable, __file__, '--backend', backend,
+                            '--sprites', str(args.sprites), '--frames', str(args.frames)])
+        return
+
+    name, blits_per_second, frame_time = blit_throughput(args.backend, args.sprites, args.frames)
+    print(f'{name}: {blits_per_second:,.0f} blits/s, {frame_time:.2f} ms per frame of {args.sprites} sprites')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,196 @@
+from settings import *
+
+
+class CollisionGrid:
+    """
+    The CollisionGrid class keeps the obstacles in the cells of a grid, every obstacle in each cell its hitbox
+    overlaps, and moves hitboxes through them. A move is swept: the cells crossed by the moving hitbox are walked
+    in the direction of motion, so a hitbox stops at the first obstacle on its way, however far it moves in a frame,
+    and only the obstacles of the crossed cells are tested.
+    A hitbox that already overlaps an obstacle, such as a character spawned in one or standing in a chunk
+    when it is built, is pushed out like the discrete check used to, instead.
+
+    :param cell_size: The width and height of a cell in pixels.
+    """
+
+    def __init__(self, cell_size=TILESIZE):
+        """
+        This method initializes an empty CollisionGrid object.
+
+        :param cell_size: The width and height of a cell in pixels.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> obstacles
+        self.obstacles = {}  # obstacle -> the index of its addition, the discrete check visits them in that order
+        self.added = 0
+
+    def cells_of(self, rect):
+        """
+        This method gets the cells a rect overlaps.
+
+        :param rect: The rect in pixels.
+        :return: A generator of (column, row) indices.
+        """
+        size = self.cell_size
+        for row in range(rect.top // size, (rect.bottom - 1) // size + 1):
+            for column in range(rect.left // size, (rect.right - 1) // size + 1):
+                yield column, row
+
+    def add(self, sprite):
+        """
+        This method adds an obstacle to every cell its hitbox overlaps.
+
+        :param sprite: The obstacle, a sprite with a hitbox.
+        """
+        for cell in self.cells_of(sprite.hitbox):
+            self.cells.setdefault(cell, []).append(sprite)
+        self.obstacles[sprite] = self.added
+        self.added += 1
+
+    def remove(self, sprite):
+        """
+        This method removes an obstacle from the grid.
+
+        :param sprite: The obstacle added before.
+        """
+        self.obstacles.pop(sprite, None)
+        for cell in self.cells_of(sprite.hitbox):
+            obstacles = self.cells.get(cell)
+            if obstacles and sprite in obstacles:
+                obstacles.remove(sprite)
+                if not obstacles:
+                    del self.cells[cell]
+
+    def overlaps(self, rect):
+        """
+        This method checks whether a rect overlaps an obstacle.
+
+        :param rect: The rect in pixels.
+        :return: Whether the rect overlaps the hitbox of an obstacle.
+        """
+        cells = self.cells
+        return any(sprite.hitbox.colliderect(rect) for cell in self.cells_of(rect) for sprite in cells.get(cell, ()))
+
+    def push_out(self, hitbox, distance_x, distance_y):
+        """
+        This method moves a hitbox along one axis with the discrete check: after the move, every obstacle
+        the hitbox overlaps, in the order they were added, puts the leading edge of the hitbox against its near side.
+        Only the obstacles of the cells the moved hitbox overlaps are checked.
+
+        :param hitbox: The hitbox to move, changed in place.
+        :param distance_x: The horizontal distance to move by, 0 for a vertical move.
+        :param distance_y: The vertical distance to move by, 0 for a horizontal move.
+        """
+        hitbox.x += distance_x
+        hitbox.y += distance_y
+        cells = self.cells
+        candidates = {sprite for cell in self.cells_of(hitbox) for sprite in cells.get(cell, ())}
+        for sprite in sorted(candidates, key=self.obstacles.__getitem__):
+            box = sprite.hitbox
+            if box.colliderect(hitbox):
+                if distance_x > 0:
+                    hitbox.right = box.left
+                elif distance_x < 0:
+                    hitbox.left = box.right
+                elif distance_y > 0:
+                    hitbox.bottom = box.top
+                elif distance_y < 0:
+                    hitbox.top = box.bottom
+
+    def move_x(self, hitbox, distance):
+        """
+        This method moves a hitbox horizontally. It stops against the nearest obstacle its leading edge crosses
+        on the way, or, like a discrete check, against an obstacle it overlaps at its target.
+        The columns between its starting position and its target are walked in the direction of motion,
+        until no later column can hold a nearer obstacle.
+
+        :param hitbox: The hitbox to move, changed in place.
+        :param distance: The distance to move by, negative to move left.
+        """
+        if distance and self.overlaps(hitbox):
+            self.push_out(hitbox, distance, 0)
+            return
+        start = hitbox.x
+        hitbox.x += distance
+        if hitbox.x == start:
+            return
+
+        size = self.cell_size
+        cells = self.cells
+        left, right, top, bottom = hitbox.left, hitbox.right, hitbox.top, hitbox.bottom
+        rows = range(top // size, (bottom - 1) // size + 1)
+        if left > start:
+            edge = start + hitbox.width  # the leading edge before the move
+            limit = right
+            for column in range(min(left, edge) // size, (right - 1) // size + 1):
+                if column * size >= limit:
+                    break
+                for row in rows:
+                    for sprite in cells.get((column, row), ()):
+                        box = sprite.hitbox
+                        if box.top < bottom and box.bottom > top and box.left < limit and \
+                                (box.left >= edge or box.right > left):
+                            limit = box.left
+            hitbox.right = limit
+        else:
+            edge = start  # the leading edge before the move
+            limit = left
+            for column in range((max(right, edge) - 1) // size, left // size - 1, -1):
+                if (column + 1) * size <= limit:
+                    break
+                for row in rows:
+                    for sprite in cells.get((column, row), ()):
+                        box = sprite.hitbox
+                        if box.top < bottom and box.bottom > top and box.right > limit and \
+                                (box.right <= edge or box.left < right):
+                            limit = box.right
+            hitbox.left = limit
+
+    def move_y(self, hitbox, distance):
+        """
+        This method moves a hitbox vertically. It stops against the nearest obstacle its leading edge crosses
+        on the way, or, like a discrete check, against an obstacle it overlaps at its target.
+        The rows between its starting position and its target are walked in the direction of motion,
+        until no later row can hold a nearer obstacle.
+
+        :param hitbox: The hitbox to move, changed in place.
+        :param distance: The distance to move by, negative to move up.
+        """
+        if distance and self.overlaps(hitbox):
+            self.push_out(hitbox, 0, distance)
+            return
+        start = hitbox.y
+        hitbox.y += distance
+        if hitbox.y == start:
+            return
+
+        size = self.cell_size
+        cells = self.cells
+        left, right, top, bottom = hitbox.left, hitbox.right, hitbox.top, hitbox.bottom
+        columns = range(left // size, (right - 1) // size + 1)
+        if top > start:
+            edge = start + hitbox.height  # the leading edge before the move
+            limit = bottom
+            for row in range(min(top, edge) // size, (bottom - 1) // size + 1):
+                if row * size >= limit:
+                    break
+                for column in columns:
+                    for sprite in cells.get((column, row), ()):
+                        box = sprite.hitbox
+                        if box.left < right and box.right > left and box.top < limit and \
+                                (box.top >= edge or box.bottom > top):
+                            limit = box.top
+            hitbox.bottom = limit
+        else:
+            edge = start  # the leading edge before the move
+            limit = top
+            for row in range((max(bottom, edge) - 1) // size, top // size - 1, -1):
+                if (row + 1) * size <= limit:
+                    break
+                for column in columns:
+                    for sprite in cells.get((column, row), ()):
+                        box = sprite.hitbox
+                        if box.left < right and box.right > left and box.bottom > limit and \
+                                (box.bottom <= edge or box.top < bottom):
+                            limit = box.bottom
+            hitbox.top = limit
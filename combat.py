@@ -0,0 +1,82 @@
+import math
+import hitmasks
+
+
+class CombatSystem:
+    """
+    The CombatSystem class resolves the player's attacks against the enemies in one batched pass per frame.
+    Hits are gathered first, then damage, invulnerability windows, knockback directions and deaths are resolved
+    together, with the player's damage and position looked up once. The side effects, such as sounds and kills,
+    are returned as events for the level to handle afterwards.
+    """
+
+    def __init__(self):
+        """
+        This method initializes a CombatSystem object. It sets up the hits gathered for the current frame.
+        """
+        self.hits = {}
+
+    def gather(self, attack_sprites, attackable_sprites):
+        """
+        This method gathers the hits of every attack sprite touching an attackable sprite.
+        Rects are compared first and only overlapping pairs are checked pixel by pixel with their masks.
+
+        :param attack_sprites: The sprites that deal damage.
+        :param attackable_sprites: The sprites that can be damaged.
+        """
+        for attack_sprite in attack_sprites:
+            for target_sprite in hitmasks.spritecollide(attack_sprite, attackable_sprites):
+                self.queue(target_sprite, attack_sprite.sprite_type)
+
+    def queue(self, target, attack_type, damage=None):
+        """
+        This method queues a hit for this frame. Only the first hit on every target counts,
+        because the first one makes the target invulnerable.
+
+        :param target: The damaged sprite.
+        :param attack_type: The type of attack ('weapon' or 'projectile').
+        :param damage: The damage of the hit, by default it is computed from the attack type.
+        """
+        if target not in self.hits:
+            self.hits[target] = (attack_type, damage)
+
+    def resolve(self, player):
+        """
+        This method resolves every hit gathered this frame. Vulnerable targets lose health, become invulnerable
+        and are pushed away from the player.
+
+        :param player: The player object.
+        :return: A list of (event, target, damage) triples, the event is 'hit' or 'death'.
+        """
+        events = []
+        if not self.hits:
+            return events
+
+        attack_damage = {'weapon': player.get_full_attack_damage()}
+        player_x, player_y = player.rect.center
+
+        for target, (attack_type, damage) in self.hits.items():
+            if not target.vulnerable:
+                continue
+
+            # knockback direction, the enemy's hit reaction reverses it
+            target_x, target_y = target.rect.center
+            delta_x = player_x - target_x
+            delta_y = player_y - target_y
+            distance = math.hypot(delta_x, delta_y)
+            if distance > 0:
+                target.direction.update(delta_x / distance, delta_y / distance)
+            else:
+                target.direction.update(0, 0)
+
+            if damage is None:
+                damage = attack_damage.get(attack_type, 0)
+            target.health -= damage
+            target.make_invulnerable(target.invincibility_timer)
+            events.append(('hit', target, damage))
+
+            if target.health <= 0:
+                events.append(('death', target, damage))
+
+        self.hits.clear()
+        return events
@@ -0,0 +1,48 @@
+class DrawList:
+    """
+    The DrawList class collects the draw commands of a frame as (surface, position) pairs with integer positions,
+    and submits them all at once with a single blits call, instead of one blit call per image.
+    A draw list is kept from frame to frame, so its list is reused, and it can be shared by several layers
+    drawn one after the other, such as the projectiles and the effects.
+    """
+
+    def __init__(self):
+        """
+        This method initializes an empty DrawList object.
+        """
+        self.commands = []
+
+    def __len__(self):
+        """
+        This method gets the number of queued draw commands.
+
+        :return: The number of queued draw commands.
+        """
+        return len(self.commands)
+
+    def add(self, image, pos):
+        """
+        This method queues an image.
+
+        :param image: The image to draw.
+        :param pos: The integer position of the top left corner of the image.
+        """
+        self.commands.append((image, pos))
+
+    def extend(self, commands):
+        """
+        This method queues several images.
+
+        :param commands: The (image, integer position) pairs to draw, in order.
+        """
+        self.commands.extend(commands)
+
+    def submit(self, target):
+        """
+        This method draws every queued image in order with one blits call and empties the list.
+
+        :param target: The surface or renderer to draw on.
+        """
+        if self.commands:
+            target.blits(self.commands, doreturn=False)
+            self.commands.clear()
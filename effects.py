@@ -0,0 +1,154 @@
+import numpy as np
+import pygame
+from settings import *
+
+
+class EffectsLayer:
+    """
+    The EffectsLayer class draws the particles and the floating damage numbers of hits and deaths.
+    Effects are not sprites: they live in preallocated ring buffers that are updated with NumPy
+    and queued on the draw list submitted after the world. When a buffer is full, the oldest effects
+    are overwritten, so huge fights never cost more than the buffer sizes.
+
+    :param particle_capacity: The maximum number of particles.
+    :param number_capacity: The maximum number of damage numbers.
+    """
+
+    def __init__(self, particle_capacity=PARTICLE_CAPACITY, number_capacity=DAMAGE_NUMBER_CAPACITY):
+        """
+        This method initializes an EffectsLayer object. It allocates the ring buffers and renders
+        the particle surfaces and the digit glyphs once.
+
+        :param particle_capacity: The maximum number of particles.
+        :param number_capacity: The maximum number of damage numbers.
+        """
+        self.random = np.random.default_rng()
+
+        # particles
+        self.particle_capacity = particle_capacity
+        self.particle_head = 0
+        self.particle_positions = np.zeros((particle_capacity, 2), dtype=np.float32)
+        self.particle_velocities = np.zeros((particle_capacity, 2), dtype=np.float32)
+        self.particle_lifetimes = np.zeros(particle_capacity, dtype=np.int32)
+        self.particle_kinds = np.zeros(particle_capacity, dtype=np.int32)
+        self.kinds = list(effect_data.keys())
+        self.particle_images = []
+        for kind in self.kinds:
+            size = effect_data[kind]['size']
+            image = pygame.Surface((size, size))
+            image.fill(effect_data[kind]['color'])
+            self.particle_images.append(image)
+
+        # damage numbers, stored as digit indices and horizontal offsets of the digits
+        self.number_capacity = number_capacity
+        self.number_head = 0
+        self.number_positions = np.zeros((number_capacity, 2), dtype=np.float32)
+        self.number_lifetimes = np.zeros(number_capacity, dtype=np.int32)
+        self.number_digits = np.full((number_capacity, DAMAGE_NUMBER_DIGITS), -1, dtype=np.int32)
+        self.number_offsets = np.zeros((number_capacity, DAMAGE_NUMBER_DIGITS), dtype=np.float32)
+        font = pygame.font.Font(UI_FONT, DAMAGE_NUMBER_FONT_SIZE)
+        self.glyphs = [self.render_glyph(font, str(digit)) for digit in range(10)]
+        self.glyph_widths = np.array([glyph.get_width() for glyph in self.glyphs], dtype=np.float32)
+        self.glyph_height = self.glyphs[0].get_height()
+
+    @staticmethod
+    def render_glyph(font, text):
+        """
+        This method renders a digit with a black outline, so it stays readable on the snow.
+
+        :param font: The font to render with.
+        :param text: The digit.
+        :return: The glyph surface.
+        """
+        outline = font.render(text, False, 'black')
+        glyph = pygame.Surface((outline.get_width() + 2, outline.get_height() + 2), pygame.SRCALPHA)
+        for pos in ((0, 1), (2, 1), (1, 0), (1, 2)):
+            glyph.blit(outline, pos)
+        glyph.blit(font.render(text, False, DAMAGE_NUMBER_COLOR), (1, 1))
+        return glyph.convert_alpha()
+
+    def burst(self, pos, kind):
+        """
+        This method emits a burst of particles flying away from a position in random directions.
+
+        :param pos: The position the particles start at.
+        :param kind: The kind of effect ('hit' or 'death').
+        """
+        data = effect_data[kind]
+        count = min(data['count'], self.particle_capacity)
+        slots = (self.particle_head + np.arange(count)) % self.particle_capacity
+        self.particle_head = (self.particle_head + count) % self.particle_capacity
+
+        angles = self.random.uniform(0, 2 * np.pi, count)
+        speeds = self.random.uniform(0.3, 1, count) * data['speed']
+        self.particle_positions[slots] = pos
+        self.particle_velocities[slots, 0] = np.cos(angles) * speeds
+        self.particle_velocities[slots, 1] = np.sin(angles) * speeds
+        self.particle_lifetimes[slots] = self.random.integers(PARTICLE_LIFETIME // 2, PARTICLE_LIFETIME, count)
+        self.particle_kinds[slots] = self.kinds.index(kind)
+
+    def damage_number(self, pos, damage):
+        """
+        This method shows a damage number rising from a position.
+
+        :param pos: The position of the bottom middle of the number.
+        :param damage: The damage to show.
+        """
+        digits = [int(digit) for digit in str(max(0, round(damage)))][-DAMAGE_NUMBER_DIGITS:]
+        widths = self.glyph_widths[digits]
+
+        slot = self.number_head
+        self.number_head = (self.number_head + 1) % self.number_capacity
+        self.number_positions[slot] = (pos[0], pos[1] - self.glyph_height)
+        self.number_lifetimes[slot] = DAMAGE_NUMBER_LIFETIME
+        self.number_digits[slot] = -1
+        self.number_digits[slot, :len(digits)] = digits
+        self.number_offsets[slot, :len(digits)] = np.cumsum(widths) - widths - widths.sum() / 2
+
+    def clear(self):
+        """
+        This method removes every effect.
+        """
+        self.particle_lifetimes[:] = 0
+        self.number_lifetimes[:] = 0
+
+    def update(self):
+        """
+        This method moves every live particle and damage number and ages them.
+        Particles slow down and fall, damage numbers rise.
+        """
+        alive = self.particle_lifetimes > 0
+        if alive.any():
+            self.particle_positions[alive] += self.particle_velocities[alive]
+            self.particle_velocities[alive] *= PARTICLE_DRAG
+            self.particle_velocities[alive, 1] += PARTICLE_GRAVITY
+            self.particle_lifetimes[alive] -= 1
+
+        alive = self.number_lifetimes > 0
+        if alive.any():
+            self.number_positions[alive, 1] -= DAMAGE_NUMBER_RISE
+            self.number_lifetimes[alive] -= 1
+
+    def draw(self, draw_list, offset):
+        """
+        This method queues every live particle and damage number on a draw list.
+
+        :param draw_list: The DrawList to queue the effects on.
+        :param offset: The camera offset.
+        """
+        alive = self.particle_lifetimes > 0
+        if alive.any():
+            positions = (self.particle_positions[alive] - (offset.x, offset.y)).astype(int).tolist()
+            images = self.particle_images
+            draw_list.extend([(images[kind], pos) for kind, pos in zip(self.particle_kinds[alive].tolist(), positions)])
+
+        alive = self.number_lifetimes > 0
+        if alive.any():
+            digits = self.number_digits[alive]
+            shown = digits >= 0
+            xs = self.number_positions[alive, 0, np.newaxis] + self.number_offsets[alive] - offset.x
+            ys = np.broadcast_to(self.number_positions[alive, 1, np.newaxis] - offset.y, xs.shape)
+            glyphs = self.glyphs
+            draw_list.extend([(glyphs[digit], (x, y)) for digit, x, y in
+                              zip(digits[shown].tolist(), xs[shown].astype(int).tolist(),
+                                  ys[shown].astype(int).tolist())])
@@ -2,47 +2,61 @@ import pygame
 from settings import *
 from characters import Characters
 from support import *
+from hitmasks import get_mask, bounding_rect
 
 
 class Enemy(Characters):
     """
     The Enemy class represents an enemy in the game. It is a subclass of Characters.
     It has methods for importing sprites, getting the player's location, getting the enemy's status,
-    performing actions, getting damage, checking death, handling cooldowns, and updating the enemy.
+    performing actions, animating, and updating the enemy.
+    Damage and death are resolved by the level's CombatSystem, the invulnerability windows end on the level's
+    timer wheel.
 
     :param enemy_name: The name of the enemy.
     :param pos: The initial position of the enemy.
     :param groups: The groups that the enemy belongs to.
-    :param obstacle_sprites: The sprites that represent obstacles.
+    :param obstacles: The CollisionGrid of the obstacles.
     :param damage_player: The function to call to damage the player.
+    :param animation_clock: The AnimationClock shared by all enemies.
+    :param timers: The level's TimerWheel.
+    :param animation_phase: The number of frames the enemy's animation is shifted by.
     """
 
-    def __init__(self, enemy_name, pos, groups, obstacle_sprites, damage_player):
+    def __init__(self, enemy_name, pos, groups, obstacles, damage_player, animation_clock,
+                 timers, animation_phase=0):
         """
         This method initializes an Enemy object. It calls the superclass's __init__ method and sets up the sprite type,
-        graphics, movement, stats, player interaction, invincibility timer, and sounds.
+        graphics, movement, stats, player interaction, and invincibility timer.
 
         :param enemy_name: The name of the enemy.
         :param pos: The initial position of the enemy.
         :param groups: The groups that the enemy belongs to.
-        :param obstacle_sprites: The sprites that represent obstacles.
+        :param obstacles: The CollisionGrid of the obstacles.
         :param damage_player: The function to call to damage the player.
+        :param animation_clock: The AnimationClock shared by all enemies.
+        :param timers: The level's TimerWheel.
+        :param animation_phase: The number of frames the enemy's animation is shifted by.
         """
+        self.enemy_name = enemy_name  # set before joining the groups, the EnemyGroup counts enemies by name
         super().__init__(groups)
         self.sprite_type = ('enemy')
 
         # graphics
+        self.animation_clock = animation_clock
         self.import_sprites(enemy_name)
         self.status = 'move'
-        self.image = self.animations[self.status][self.frame_index]
+        self.animation_phase = animation_phase
+        self.image = self.animations[self.status].frame(self.animation_phase)
 
-        # movement
+        # movement, the hitbox fits the opaque pixels of the first frame
         self.rect = self.image.get_rect(topleft=pos)
-        self.hitbox = self.rect.inflate(0, -10)
-        self.obstacle_sprites = obstacle_sprites
+        self.mask = get_mask(self.image)
+        self.hitbox = bounding_rect(self.mask).move(self.rect.topleft)
+        self.hitbox_offset = (self.hitbox.centerx - self.rect.centerx, self.hitbox.centery - self.rect.centery)
+        self.obstacles = obstacles
 
         # stats
-        self.enemy_name = enemy_name
         enemy_info = enemy_data[self.enemy_name]
         self.health = enemy_info['health']
         self.speed = enemy_info['speed']
@@ -51,33 +65,24 @@ class Enemy(Characters):
         self.attack_radius = enemy_info['attack_radius']
 
         # player interaction
-        self.can_attack = True
-        self.attack_time = None
-        self.attack_cooldown = 400
         self.damage_player = damage_player
 
         # invincibility timer
+        self.timers = timers
         self.vulnerable = True
-        self.hit_time = None
         self.invincibility_timer = 300
 
-        # sounds
-        self.death_sound = pygame.mixer.Sound('sounds/death.wav')
-        self.hit_sound = pygame.mixer.Sound('sounds/hit.wav')
-        self.death_sound.set_volume(0.05)
-        self.hit_sound.set_volume(0.05)
-
     def import_sprites(self, name):
         """
         This method imports the sprites for the enemy.
-        It sets up the animations dictionary with the paths to the sprite images.
+        It sets up the animations dictionary with the tracks shared by all enemies of the same type.
 
         :param name: The name of the enemy.
         """
-        self.animations = {'move': [], 'attack': []}
+        self.animations = {'move': None, 'attack': None}
         main_path = f'graphics/enemies/{name}/'
         for animation in self.animations.keys():
-            self.animations[animation] = import_folder(main_path + animation)
+            self.animations[animation] = self.animation_clock.track(main_path + animation)
 
     def get_player_location(self, player):
         """
@@ -120,73 +125,65 @@ class Enemy(Characters):
         :param player: The player object.
         """
         if self.status == 'attack':
-            self.attack_time = pygame.time.get_ticks()
             self.damage_player(self.attack_damage)
         elif self.status == 'move':
             self.direction = self.get_player_location(player)[1]
 
-    def get_damage(self, player, attack_type):
+    def hit_reaction(self):
         """
-        This method damages the enemy. If the enemy is vulnerable, it decreases the enemy's health based on
-        the attack type and sets the enemy to be invulnerable.
-
-        :param player: The player object.
-        :param attack_type: The type of attack ('weapon' or 'projectile').
+        This method handles the enemy's hit reaction. If the enemy is not vulnerable, it moves the enemy
+        in the opposite direction based on its resistance.
         """
-        if self.vulnerable:
-            self.hit_sound.play()
-            self.direction = self.get_player_location(player)[1]
-            if attack_type == 'weapon':
-                self.health -= player.get_full_attack_damage()
-            else:
-                pass
-
-            self.hit_time = pygame.time.get_ticks()
-            self.vulnerable = False
+        if not self.vulnerable:
+            self.direction *= -self.resistance
 
-    def check_death(self):
-        """
-        This method checks if the enemy has died. If the enemy's health is 0 or less,
-        it removes the enemy from the enemies list, kills the enemy,
-        and plays the death sound.
+    def place(self, pos):
         """
-        if self.health <= 0:
-            if self.enemy_name in enemies:
-                enemies.remove(self.enemy_name)
-            self.kill()
-            self.death_sound.play()
+        This method moves the enemy to another position, keeping its hitbox where it is relative to its rect.
 
-    def cooldowns(self):
-        """
-        This method handles the enemy's cooldowns. If the enemy cannot attack, it checks
-        if the attack cooldown has passed and allows the enemy to attack.
-        If the enemy is not vulnerable, it checks if the invincibility timer has passed and makes the enemy vulnerable.
+        :param pos: The new position of the top left corner of the enemy's rect.
         """
-        current_time = pygame.time.get_ticks()
-        if not self.can_attack:
-            if current_time - self.attack_time >= self.attack_cooldown:
-                self.can_attack = True
-        if not self.vulnerable:
-            if current_time - self.hit_time >= self.invincibility_timer:
-                self.vulnerable = True
+        dx, dy = pos[0] - self.rect.x, pos[1] - self.rect.y
+        self.rect.move_ip(dx, dy)
+        self.hitbox.move_ip(dx, dy)
 
-    def hit_reaction(self):
+    def animate(self):
         """
-        This method handles the enemy's hit reaction. If the enemy is not vulnerable, it moves the enemy
-        in the opposite direction based on its resistance.
+        This method animates the enemy.
+        It sets the enemy's image and mask to the current frame of the shared track for its status,
+        shifted by its phase.
         """
-        if not self.vulnerable:
-            self.direction *= -self.resistance
+        self.image = self.animations[self.status].frame(self.animation_phase)
+        self.mask = get_mask(self.image)
+        self.rect = self.image.get_rect(center=(self.hitbox.centerx - self.hitbox_offset[0],
+                                                self.hitbox.centery - self.hitbox_offset[1]))
 
     def update(self):
         """
-        This method updates the enemy. It handles the hit reaction, moves the enemy, handles cooldowns,
-        and checks if the enemy has died.
+        This method updates the enemy. It handles the hit reaction, moves the enemy and animates the enemy.
         """
         self.hit_reaction()
         self.move(self.speed)
-        self.cooldowns()
-        self.check_death()
+        self.animate()
+
+    def apply_steering(self, x, y, direction_x, direction_y, status):
+        """
+        This method applies the movement and the AI computed for the enemy by the AI worker, in place of update
+        and enemy_update. It places the hitbox, sets the direction and the status, damages the player
+        if the enemy attacks, and animates the enemy.
+
+        :param x: The x-coordinate of the top left corner of the hitbox.
+        :param y: The y-coordinate of the top left corner of the hitbox.
+        :param direction_x: The x-component of the direction.
+        :param direction_y: The y-component of the direction.
+        :param status: The status, 'move' or 'attack'.
+        """
+        self.hitbox.topleft = (x, y)
+        self.direction.update(direction_x, direction_y)
+        self.status = status
+        if status == 'attack':
+            self.damage_player(self.attack_damage)
+        self.animate()
 
     def enemy_update(self, player):
         """
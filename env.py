@@ -0,0 +1,272 @@
+import multiprocessing
+import numpy as np
+import pygame
+from settings import *
+from level import Level
+
+ENEMY_NAMES = list(enemy_data.keys())
+PLAYER_FEATURES = 7  # x, y, health, attack, speed, wave, upgrade due
+ENEMY_FEATURES = 4  # x and y relative to the player, health, type
+
+
+class SimulatedClock:
+    """
+    The SimulatedClock class is the time source of a headless level. Its time only moves when it is advanced,
+    so the timers of a simulation do not depend on how fast it runs.
+    """
+
+    def __init__(self):
+        """
+        This method initializes a SimulatedClock object at time 0.
+        """
+        self.time = 0
+
+    def get_ticks(self):
+        """
+        This method gets the simulated time, like pygame.time.get_ticks.
+
+        :return: The simulated time in milliseconds.
+        """
+        return int(self.time)
+
+    def advance(self, milliseconds):
+        """
+        This method moves the simulated time forward.
+
+        :param milliseconds: The time to move forward by.
+        """
+        self.time += milliseconds
+
+
+class SurvivorsEnv:
+    """
+    The SurvivorsEnv class wraps a headless level in a gym-style environment with reset, step and observe.
+    Every step applies an action and advances the level by a number of frames of simulated time.
+
+    An action is an array of five numbers: the horizontal and vertical movement (-1, 0 or 1), the horizontal
+    and vertical aim of the projectiles (no projectile when both are 0), and the index of the stat to upgrade,
+    used when an upgrade is due.
+    An observation is a flat float32 array: the player's x, y, health, attack, speed, the wave and whether an
+    upgrade is due, followed by the position relative to the player, health and type of the nearest enemies,
+    padded with zeros. The reward is the number of enemies killed during the step.
+
+    :param seed: The seed of the first level, or None for a random seed.
+    :param max_enemies: The number of nearest enemies in an observation.
+    :param frame_skip: The number of frames every step advances the level by.
+    """
+
+    def __init__(self, seed=None, max_enemies=ENV_MAX_ENEMIES, frame_skip=ENV_FRAME_SKIP):
+        """
+        This method initializes a SurvivorsEnv object. The level is created by reset.
+
+        :param seed: The seed of the first level, or None for a random seed.
+        :param max_enemies: The number of nearest enemies in an observation.
+        :param frame_skip: The number of frames every step advances the level by.
+        """
+        self.seed = seed
+        self.max_enemies = max_enemies
+        self.frame_skip = frame_skip
+        self.observation_size = PLAYER_FEATURES + max_enemies * ENEMY_FEATURES
+        self.clock = None
+        self.level = None
+
+    def reset(self, seed=None):
+        """
+        This method starts a new game on a new headless level. Assets are cached, so only the map is rebuilt.
+
+        :param seed: The seed of the level, by default the seed given to the environment.
+        :return: The first observation.
+        """
+        if seed is not None:
+            self.seed = seed
+        self.clock = SimulatedClock()
+        self.level = Level(headless=True, seed=self.seed, get_ticks=self.clock.get_ticks)
+        if self.seed is not None:
+            self.seed += 1  # the next game without a seed plays differently, but still reproducibly
+        return self.observe()
+
+    def step(self, action):
+        """
+        This method applies an action and advances the level. A due upgrade is applied first.
+        The step ends early when the game is over or another upgrade is due, like the game freezes for the menu.
+
+        :param action: The action, see the class documentation.
+        :return: The observation, the reward, whether the game is over, and a dictionary of information.
+        """
+        level = self.level
+        player = level.player
+        move_x, move_y, aim_x, aim_y, upgrade_index = action
+        if not player.upgrade_performed:
+            level.memory.wave_boundary()  # the upgrade screen of the game
+            player.upgrade(int(upgrade_index) % len(player.stats))
+
+        player.steer(int(np.sign(move_x)), int(np.sign(move_y)))
+        aim = pygame.math.Vector2(float(aim_x), float(aim_y))
+        player.aim = aim.normalize() if aim.length_squared() != 0 else None
+
+        kills = level.enemies_killed
+        for _ in range(self.frame_skip):
+            self.clock.advance(1000 / FPS)
+            level.step()
+            if level.outcome is not None or not player.upgrade_performed:
+                break
+
+        info = {'wave': level.waves.level, 'kills': level.enemies_killed, 'health': player.health,
+                'outcome': level.outcome, 'time': self.clock.get_ticks()}
+        return self.observe(), level.enemies_killed - kills, level.outcome is not None, info
+
+    def observe(self):
+        """
+        This method describes the level as a flat array of numbers, see the class documentation.
+
+        :return: The observation.
+        """
+        level = self.level
+        player = level.player
+        observation = np.zeros(self.observation_size, dtype=np.float32)
+        observation[:PLAYER_FEATURES] = (*player.hitbox.center, player.health, player.stats['attack'],
+                                         player.stats['speed'], level.waves.level, not player.upgrade_performed)
+
+        enemies = level.enemy_sprites.sprites()
+        if enemies:
+            features = np.array([(*enemy.hitbox.center, enemy.health, ENEMY_NAMES.index(enemy.enemy_name) + 1)
+                                 for enemy in enemies], dtype=np.float32)
+            features[:, :2] -= player.hitbox.center
+            nearest = np.argsort(np.hypot(features[:, 0], features[:, 1]), kind='stable')[:self.max_enemies]
+            observation[PLAYER_FEATURES:PLAYER_FEATURES + len(nearest) * ENEMY_FEATURES] = features[nearest].ravel()
+        return observation
+
+    def close(self):
+        """
+        This method frees the level.
+        """
+        self.level = None
+
+
+def step_or_reset(env, action):
+    """
+    This function steps an environment and starts a new game when the game is over.
+    The last observation of the finished game is kept in the information.
+
+    :param env: The environment.
+    :param action: The action.
+    :return: The observation, the reward, whether the game was over, and a dictionary of information.
+    """
+    observation, reward, done, info = env.step(action)
+    if done:
+        info['final_observation'] = observation
+        observation = env.reset()
+    return observation, reward, done, info
+
+
+def env_worker(connection, seed, max_enemies, frame_skip):
+    """
+    This function runs an environment in a worker process. It answers the commands sent by a VectorEnv
+    until it is told to close.
+
+    :param connection: The worker's end of the pipe.
+    :param seed: The seed of the environment.
+    :param max_enemies: The number of nearest enemies in an observation.
+    :param frame_skip: The number of frames every step advances the level by.
+    """
+    env = SurvivorsEnv(seed, max_enemies, frame_skip)
+    while True:
+        command, data = connection.recv()
+        if command == 'reset':
+            connection.send(env.reset(data))
+        elif command == 'step':
+            connection.send(step_or_reset(env, data))
+        elif command == 'close':
+            env.close()
+            connection.close()
+            return
+
+
+class VectorEnv:
+    """
+    The VectorEnv class steps several independent environments in lockstep. The environments run in this process,
+    one after the other, or each in its own worker process, all at the same time.
+    Observations, rewards and game over flags are returned as stacked NumPy arrays, one row per environment,
+    and a finished game is replaced by a new one right away.
+
+    :param num_envs: The number of environments.
+    :param seed: The seed of the first environment, the others get the following seeds, or None for random seeds.
+    :param processes: Whether every environment runs in its own worker process.
+    :param max_enemies: The number of nearest enemies in an observation.
+    :param frame_skip: The number of frames every step advances the levels by.
+    """
+
+    def __init__(self, num_envs, seed=None, processes=False, max_enemies=ENV_MAX_ENEMIES, frame_skip=ENV_FRAME_SKIP):
+        """
+        This method initializes a VectorEnv object. It creates the environments or starts the worker processes.
+
+        :param num_envs: The number of environments.
+        :param seed: The seed of the first environment, the others get the following seeds, or None for random seeds.
+        :param processes: Whether every environment runs in its own worker process.
+        :param max_enemies: The number of nearest enemies in an observation.
+        :param frame_skip: The number of frames every step advances the levels by.
+        """
+        self.num_envs = num_envs
+        self.processes = processes
+        seeds = [None if seed is None else seed + index * ENV_SEED_STRIDE for index in range(num_envs)]
+
+        self.envs = []
+        self.connections = []
+        self.workers = []
+        if processes:
+            for env_seed in seeds:
+                connection, worker_connection = multiprocessing.Pipe()
+                worker = multiprocessing.Process(target=env_worker, daemon=True,
+                                                 args=(worker_connection, env_seed, max_enemies, frame_skip))
+                worker.start()
+                worker_connection.close()
+                self.connections.append(connection)
+                self.workers.append(worker)
+        else:
+            self.envs = [SurvivorsEnv(env_seed, max_enemies, frame_skip) for env_seed in seeds]
+
+    def reset(self):
+        """
+        This method starts a new game in every environment.
+
+        :return: The stacked observations.
+        """
+        if self.processes:
+            for connection in self.connections:
+                connection.send(('reset', None))
+            return np.stack([connection.recv() for connection in self.connections])
+        return np.stack([env.reset() for env in self.envs])
+
+    def step(self, actions):
+        """
+        This method steps every environment with its action. Worker processes are all sent their action
+        before any result is waited for, so they step at the same time.
+
+        :param actions: The actions, one row per environment.
+        :return: The stacked observations, rewards and game over flags, and a list of information dictionaries.
+        """
+        if self.processes:
+            for connection, action in zip(self.connections, actions):
+                connection.send(('step', action))
+            results = [connection.recv() for connection in self.connections]
+        else:
+            results = [step_or_reset(env, action) for env, action in zip(self.envs, actions)]
+
+        observations, rewards, dones, infos = zip(*results)
+        return (np.stack(observations), np.array(rewards, dtype=np.float32), np.array(dones, dtype=bool),
+                list(infos))
+
+    def close(self):
+        """
+        This method closes the environments and stops the worker processes.
+        """
+        for connection in self.connections:
+            connection.send(('close', None))
+            connection.close()
+        for worker in self.workers:
+            worker.join()
+        for env in self.envs:
+            env.close()
+        self.connections = []
+        self.workers = []
+        self.envs = []
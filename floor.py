@@ -0,0 +1,169 @@
+from collections import OrderedDict
+import os
+import numpy as np
+import pygame
+from settings import *
+from assets import preloader
+from world import MapLayer
+
+
+def build_tileset(source=FLOOR_SOURCE, path=FLOOR_TILESET, index_path=FLOOR_TILESET_INDEX):
+    """
+    This function builds the floor tileset from the full floor image. Every distinct combination of the floor layers
+    is one tile, cropped from the first place it appears at. The tiles are saved side by side in one image,
+    and the combinations, one per line, in the index, so the full image is only decoded again
+    when the layers change.
+
+    :param source: The path to the full floor image.
+    :param path: The path to the tileset image.
+    :param index_path: The path to the tileset index.
+    :return: The tileset surface, not converted.
+    """
+    combinations = {}  # combination -> first (column, row)
+    for rows in zip(*[MapLayer(layer).read() for layer in FLOOR_LAYERS]):
+        row_index = rows[0][0]
+        for column_index, combination in enumerate(zip(*[row for _, row in rows])):
+            combinations.setdefault(combination, (column_index, row_index))
+
+    floor = pygame.image.load(source)
+    tileset = pygame.Surface((len(combinations) * TILESIZE, TILESIZE))
+    for index, (column, row) in enumerate(combinations.values()):
+        tileset.blit(floor, (index * TILESIZE, 0), (column * TILESIZE, row * TILESIZE, TILESIZE, TILESIZE))
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    pygame.image.save(tileset, path)
+    with open(index_path, 'w') as file:
+        for combination in combinations:
+            file.write(','.join(combination) + '\n')
+    return tileset
+
+
+class FloorRenderer:
+    """
+    The FloorRenderer class draws the floor from the floor layers of the map and a small tileset,
+    instead of one image of the whole map. The floor is pre-rendered in square chunks of tiles the first time
+    they are visible, and the most recently visible chunks are kept, so a frame only draws a few chunk surfaces.
+
+    :param chunk_size: The width and height of a pre-rendered chunk in tiles.
+    :param cache_size: The maximum number of pre-rendered chunks kept.
+    """
+
+    def __init__(self, chunk_size=FLOOR_CHUNK_SIZE, cache_size=FLOOR_CACHE_SIZE):
+        """
+        This method initializes a FloorRenderer object. It indexes the floor layers and loads the tileset,
+        building it first if it is missing.
+
+        :param chunk_size: The width and height of a pre-rendered chunk in tiles.
+        :param cache_size: The maximum number of pre-rendered chunks kept.
+        """
+        self.layers = [MapLayer(layer) for layer in FLOOR_LAYERS]
+        self.columns = self.layers[0].columns
+        self.rows = self.layers[0].rows
+        self.rect = pygame.Rect(0, 0, self.columns * TILESIZE, self.rows * TILESIZE)
+        self.chunk_size = chunk_size
+        self.chunk_pixels = chunk_size * TILESIZE
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # chunk -> surface, from the least to the most recently visible
+
+        # tileset
+        if os.path.exists(FLOOR_TILESET) and os.path.exists(FLOOR_TILESET_INDEX):
+            self.load_tileset(preloader.image(FLOOR_TILESET, alpha=False))
+        else:
+            self.load_tileset(preloader.convert(build_tileset(), False))
+
+    def load_tileset(self, tileset):
+        """
+        This method cuts the tileset into tiles, reads its index and forgets the pre-rendered chunks.
+
+        :param tileset: The converted tileset surface.
+        """
+        self.tiles = [tileset.subsurface((index * TILESIZE, 0, TILESIZE, TILESIZE))
+                      for index in range(tileset.get_width() // TILESIZE)]
+        with open(FLOOR_TILESET_INDEX) as file:
+            self.tile_index = {tuple(line.rstrip('\n').split(',')): index for index, line in enumerate(file)}
+        self.cache.clear()
+
+    def read_tiles(self, first_row=0, last_row=None, first_column=0, last_column=None):
+        """
+        This method reads the tile indices of a block of the map, row by row.
+
+        :param first_row: The index of the first row.
+        :param last_row: The index after the last row, by default the end of the map.
+        :param first_column: The index of the first column.
+        :param last_column: The index after the last column, by default the end of the rows.
+        :return: A generator of (row index, list of tile indices) pairs.
+        """
+        readers = [layer.read(first_row, last_row, first_column, last_column) for layer in self.layers]
+        for rows in zip(*readers):
+            combinations = list(zip(*[row for _, row in rows]))
+            if not all(combination in self.tile_index for combination in combinations):
+                # the layers changed since the tileset was built
+                self.load_tileset(preloader.convert(build_tileset(), False))
+            yield rows[0][0], [self.tile_index[combination] for combination in combinations]
+
+    def render_chunk(self, chunk):
+        """
+        This method pre-renders the floor of a chunk on its own surface.
+
+        :param chunk: The (column, row) index of the chunk.
+        :return: The surface of the chunk.
+        """
+        first_column = chunk[0] * self.chunk_size
+        first_row = chunk[1] * self.chunk_size
+        rect = pygame.Rect(first_column * TILESIZE, first_row * TILESIZE,
+                           self.chunk_pixels, self.chunk_pixels).clip(self.rect)
+        surface = preloader.convert(pygame.Surface(rect.size), False)
+
+        tiles = self.tiles
+        blit_sequence = []
+        for row_index, row in self.read_tiles(first_row, first_row + self.chunk_size,
+                                              first_column, first_column + self.chunk_size):
+            y = (row_index - first_row) * TILESIZE
+            blit_sequence += [(tiles[index], (column * TILESIZE, y)) for column, index in enumerate(row)]
+        surface.blits(blit_sequence, doreturn=False)
+        return surface
+
+    def chunk_surface(self, chunk):
+        """
+        This method gets the surface of a chunk, pre-rendering it if it is not cached,
+        and evicts the least recently visible chunks beyond the cache size.
+
+        :param chunk: The (column, row) index of the chunk.
+        :return: The surface of the chunk.
+        """
+        surface = self.cache.get(chunk)
+        if surface is None:
+            surface = self.render_chunk(chunk)
+            self.cache[chunk] = surface
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(chunk)
+        return surface
+
+    def visible(self, view):
+        """
+        This method gets the floor chunks visible in a view.
+
+        :param view: The visible area of the map in pixels.
+        :return: A list of (surface, position of the top left corner in the map) pairs.
+        """
+        view = view.clip(self.rect)
+        if not view.width or not view.height:
+            return []
+        chunk_pixels = self.chunk_pixels
+        return [(self.chunk_surface((x, y)), (x * chunk_pixels, y * chunk_pixels))
+                for y in range(view.top // chunk_pixels, (view.bottom - 1) // chunk_pixels + 1)
+                for x in range(view.left // chunk_pixels, (view.right - 1) // chunk_pixels + 1)]
+
+    def overview(self):
+        """
+        This method draws the whole floor with one pixel per tile, in the average color of the tile.
+
+        :return: The overview surface.
+        """
+        colors = np.array([pygame.transform.average_color(tile)[:3] for tile in self.tiles], dtype=np.uint8)
+        indices = np.zeros((self.rows, self.columns), dtype=np.intp)
+        for row_index, row in self.read_tiles():
+            indices[row_index] = row
+        return pygame.surfarray.make_surface(colors[indices].transpose(1, 0, 2))
@@ -0,0 +1,56 @@
+from weakref import WeakKeyDictionary
+import pygame
+
+# one mask per surface, shared by every sprite showing that surface
+_masks = WeakKeyDictionary()
+
+
+def get_mask(surface):
+    """
+    This function gets the collision mask of a surface, building it the first time it is requested.
+
+    :param surface: The surface.
+    :return: The mask of the opaque pixels of the surface.
+    """
+    mask = _masks.get(surface)
+    if mask is None:
+        mask = pygame.mask.from_surface(surface)
+        _masks[surface] = mask
+    return mask
+
+
+def precompute(surfaces):
+    """
+    This function builds the masks of several surfaces up front, so no mask is built during play.
+
+    :param surfaces: The surfaces.
+    """
+    for surface in surfaces:
+        get_mask(surface)
+
+
+def bounding_rect(mask):
+    """
+    This function gets the smallest rectangle containing every opaque pixel of a mask.
+
+    :param mask: The mask.
+    :return: The rectangle, relative to the top left corner of the mask.
+    """
+    rects = mask.get_bounding_rects()
+    if not rects:
+        return pygame.Rect((0, 0), mask.get_size())
+    return rects[0].unionall(rects[1:])
+
+
+def spritecollide(sprite, group):
+    """
+    This function finds the sprites of a group touching a sprite. The rects are compared first,
+    and only the sprites whose rects overlap are checked pixel by pixel with their masks.
+    Every sprite needs a mask attribute.
+
+    :param sprite: The sprite.
+    :param group: The group of sprites to check.
+    :return: A list of the touching sprites.
+    """
+    return [target for target in pygame.sprite.spritecollide(sprite, group, False)
+            if pygame.sprite.collide_mask(sprite, target)]
@@ -1,40 +1,88 @@
-import sys
+from operator import attrgetter
 import pygame
-import os
-import settings
 from settings import *
 from tile import Tile
 from player import Player
 from support import *
-from random import choice, randint
-from weapon import Weapon
+from random import Random
+from weapon import Weapon, flip
 from debug import debug
 from UI import UI
 from enemy import Enemy
 from upgrade import Upgrade
+from animation import AnimationClock
+from assets import preloader
+from audio import AudioManager
+from waves import WaveManager, EnemyGroup
+from combat import CombatSystem
+from resolution import ResolutionScaler
+from ai_scheduler import AIScheduler
+from ai_worker import AIWorker
+from minimap import Minimap
+from renderer import get_renderer
+from hitmasks import precompute
+from projectiles import ProjectileSystem
+from effects import EffectsLayer
+from memory import MemoryMonitor
+from timers import TimerWheel
+from drawlist import DrawList
+from world import World
+from collision import CollisionGrid
+from floor import FloorRenderer
 
 
 class Level:
     """
     The Level class represents a level in the game. It contains methods for creating the map,
-    creating attacks, creating enemies, and running the game logic. It also handles player logic,
-    checks for player death, and displays game over and win screens.
+    creating attacks, creating enemies, and running the game logic. It also handles player logic
+    and checks for player death and win.
+    A headless level has no display, UI, effects or sounds and is advanced with step, for simulations.
+    All of its randomness comes from its own random generator and all of its timers from its timer wheel,
+    driven by its get_ticks function, so several levels can run side by side and a seeded level
+    with a simulated clock always plays out the same.
+
+    :param headless: Whether the level runs without a display.
+    :param seed: The seed of the level's random generator, or None for a random seed.
+    :param get_ticks: The function giving the current time in milliseconds.
     """
 
-    def __init__(self):
+    def __init__(self, headless=False, seed=None, get_ticks=pygame.time.get_ticks):
         """
         This method initializes a Level object. It sets up the display surface, sprite groups,
         UI, upgrades, and sounds. It also calls the create_map method to create the map.
+
+        :param headless: Whether the level runs without a display.
+        :param seed: The seed of the level's random generator, or None for a random seed.
+        :param get_ticks: The function giving the current time in milliseconds.
         """
 
-        # get the display surface
-        self.display_surface = pygame.display.get_surface()
+        self.headless = headless
+        self.random = Random(seed)
+        self.get_ticks = get_ticks
+        self.timers = TimerWheel(get_ticks)
+
+        # get the renderer and its HUD surface
+        self.renderer = None if headless else get_renderer()
+        self.display_surface = None if headless else self.renderer.surface
         self.game_paused = False
+        self.backdrop = None
+        self.outcome = None
+        self.enemies_killed = 0
 
-        # sprite group setup
-        self.visible_sprites = YSortCameraGroup()
-        self.obstacle_sprites = pygame.sprite.Group()
+        # sprite group setup, a headless level never draws, so it does not need the camera
+        self.visible_sprites = pygame.sprite.Group() if headless else YSortCameraGroup()
+        self.obstacles = CollisionGrid()
+
+        # registries, only the dynamic ones are updated every frame
+        self.static_sprites = pygame.sprite.Group()
         self.player_sprites = pygame.sprite.Group()
+        self.waves = WaveManager(random=self.random)
+        self.waves.add_listener(self.wave_cleared)
+        self.enemy_sprites = EnemyGroup(self.waves)
+        self.ai_scheduler = AIScheduler()
+        self.ai_worker = None
+        self.local_enemies = []
+        self.effect_sprites = pygame.sprite.Group()
 
         # sprites
         self.opposite_attack = None
@@ -42,77 +90,112 @@ class Level:
         self.attack_sprites = pygame.sprite.Group()
         self.attackable_sprites = pygame.sprite.Group()
         self.collectable_sprites = pygame.sprite.Group()
+        self.spawn_area = pygame.Rect(ENEMY_SPAWN_AREA)
+        self.combat = CombatSystem()
+        self.projectiles = ProjectileSystem()
+        self.effects = None if headless else EffectsLayer()
+        self.overlay = DrawList()
+
+        # animations shared by all enemies
+        self.animation_clock = AnimationClock()
+
+        # sound effects
+        self.audio = AudioManager(enabled=not headless)
 
         # sprite setup
         self.create_map()
+        self.precompute_masks()
+
+        # enemy AI worker
+        if AI_WORKER:
+            try:
+                self.ai_worker = AIWorker([image.get_size() for image in self.world.object_images])
+            except (OSError, EOFError):
+                self.ai_worker = None  # the enemies are updated in this process
 
         # UI setup
-        self.ui = UI()
-        self.upgrade = Upgrade(self.player)
+        self.ui = None if headless else UI()
+        self.minimap = None if headless else Minimap(self.visible_sprites.floor.rect.width,
+                                                     self.visible_sprites.floor.overview())
+        self.upgrade = None if headless else Upgrade(self.player)
 
         self.upgrade_performed = False
 
-        # sounds
-        self.haps = pygame.mixer.Sound('sounds/haps.mp3')
-        self.haps.set_volume(0.4)
-        self.victory = pygame.mixer.Sound('sounds/victory.mp3')
-        self.victory.set_volume(0.4)
-        self.gameOver = pygame.mixer.Sound('sounds/gameOver.wav')
-        self.gameOver.set_volume(0.4)
-        self.player_hit_sound = pygame.mixer.Sound('sounds/player_hit.wav')
-        self.player_hit_sound.set_volume(0.3)
-        self.background_music = pygame.mixer.Sound('sounds/background_music.wav')
-        self.background_music.set_volume(0.1)
-        self.background_music.play(loops=-1)
+        # music
+        self.audio.play_music()
+
+        # memory, created last so the deferred policy freezes every startup object
+        self.memory = MemoryMonitor()
 
     def create_map(self):
         """
-        This method creates the map for the game. It imports the map layout and graphics from CSV files and folders,
-        and creates tiles for each element in the map.
+        This method creates the map for the game. It sets up the World, which streams the tiles of the map
+        in chunks around the player, creates the player at its entity position and builds the chunks around it.
         """
 
-        layout = {
-            'boundary': import_csv('map/map2_FloorBlocks.csv'),
-            'object': import_csv('map/map2_Objects.csv'),
-            'food': import_csv('map/map2_Food.csv'),
-            'entity': import_csv('map/map2_Entities.csv'),
-        }
         graphics = {
             'objects': import_folder('graphics/Objects'),
             'food': import_folder('graphics/Food'),
         }
+        self.food_images = graphics['food']
+        self.world = World(self.visible_sprites, self.obstacles, self.static_sprites, self.create_food,
+                           graphics['objects'], self.food_images, self.random)
+
+        x, y = self.world.entities['394'][0]
+        self.player = Player((x, y), [self.visible_sprites, self.player_sprites],
+                             self.obstacles,
+                             self.create_attack, self.destroy_weapon,
+                             self.create_projectile, self.timers,
+                             manual_input=not self.headless)
+        self.world.update(self.player.rect.center, self.player.direction)
+
+    def precompute_masks(self):
+        """
+        This method builds the collision masks of every enemy animation frame and every weapon direction,
+        so no mask is built during play.
+        """
 
-        for style, layout in layout.items():
-            for row_index, row in enumerate(layout):
-                for column_index, column in enumerate(row):
-                    if column != '-1':
-                        x = column_index * TILESIZE
-                        y = row_index * TILESIZE
-                        if style == 'boundary':
-                            Tile((x, y), [self.obstacle_sprites], 'invisible')
-                        if style == 'object':
-                            surface = graphics['objects'][int(column)]
-                            Tile((x, y), [self.visible_sprites, self.obstacle_sprites], 'object', surface)
-                        if style == 'food':
-                            random_food_image = choice(graphics['food'])
-                            Tile((x, y), [self.visible_sprites, self.collectable_sprites], 'food', random_food_image)
-                        if style == 'entity':
-                            if column == '394':
-                                self.player = Player((x, y), [self.visible_sprites, self.player_sprites],
-                                                     self.obstacle_sprites,
-                                                     self.create_attack, self.destroy_weapon)
+        for enemy_name in enemy_data:
+            for animation in ('move', 'attack'):
+                precompute(self.animation_clock.track(f'graphics/enemies/{enemy_name}/{animation}').frames)
+        for weapon in weapon_data:
+            for direction in ('up', 'down', 'left', 'right'):
+                image = preloader.image(f'graphics/weapons/{weapon}/{direction}.png')
+                precompute([image, flip(image)])
+
+    def create_food(self, pos, image):
+        """
+        This method creates a food tile that the player can collect.
+
+        :param pos: The position of the food.
+        :param image: The image of the food.
+        :return: The food tile.
+        """
+
+        return Tile(pos, [self.visible_sprites, self.collectable_sprites, self.static_sprites], 'food', image)
 
     def create_attack(self):
         """
         This method creates an attack for the player.
         It creates a Weapon object and assigns it to the current_attack attribute.
-        If the level is 3 or higher, it also creates an opposite attack.
+        If the level is 3 or higher, it also creates an opposite attack. It then plays the attack sound.
         """
 
-        self.current_attack = Weapon(self.player, [self.visible_sprites, self.attack_sprites])
-        if settings.LEVEL >= 3:
+        self.current_attack = Weapon(self.player, [self.visible_sprites, self.attack_sprites, self.effect_sprites])
+        if self.waves.level >= 3:
             self.opposite_attack = self.current_attack.spawn_opposite_weapon(
-                self.player, [self.visible_sprites, self.attack_sprites])
+                self.player, [self.visible_sprites, self.attack_sprites, self.effect_sprites])
+        self.audio.play('attack')
+
+    def create_projectile(self, direction):
+        """
+        This method fires a projectile from the player in the given direction and plays the attack sound.
+
+        :param direction: The normalized direction of the projectile.
+        """
+
+        if self.projectiles.fire(self.player.rect.center, direction, self.player.get_full_projectile_damage()):
+            self.audio.play('attack')
 
     def destroy_weapon(self):
         """
@@ -128,37 +211,138 @@ class Level:
         self.current_attack = None
         self.opposite_attack = None
 
-    def create_enemy(self):
+    def create_enemy(self, enemy_names):
         """
-        This method creates enemies for the game. It selects a random enemy from the list of enemies
-        and creates an Enemy object for it.
+        This method creates enemies for the game. It creates an Enemy object at a random position
+        of the spawn area for every given enemy name, in a resident chunk of the world.
+        A position where the enemy's hitbox overlaps an obstacle is rejected and another one is picked,
+        up to SPAWN_ATTEMPTS positions.
+
+        :param enemy_names: The names of the enemies to create.
+        """
+
+        for enemy_name in enemy_names:
+            enemy = self.spawn_enemy(enemy_name, self.world.spawn_position(self.random, self.spawn_area))
+            for _ in range(SPAWN_ATTEMPTS - 1):
+                if not self.obstacles.overlaps(enemy.hitbox):
+                    break
+                enemy.place(self.world.spawn_position(self.random, self.spawn_area))
+
+    def spawn_enemy(self, enemy_name, pos):
+        """
+        This method creates a single enemy.
+
+        :param enemy_name: The name of the enemy.
+        :param pos: The position of the enemy.
+        :return: The created enemy.
+        """
+
+        enemy = Enemy(enemy_name, pos, [self.visible_sprites, self.attackable_sprites, self.enemy_sprites],
+                      self.obstacles, self.damage_player, self.animation_clock, self.timers,
+                      self.random.randint(0, 3))
+        return enemy
+
+    def wave_cleared(self, level):
+        """
+        This method is called by the WaveManager when a wave is cleared.
+        It resets the upgrade flag in the player, so the upgrade menu is shown before the next wave,
+        and tells the memory monitor, which records the wave boundary once the upgrade menu is shown.
+
+        :param level: The level of the cleared wave.
         """
 
-        for enemy in settings.enemies:
-            enemy_name = enemy
-            Enemy(enemy_name, (randint(1100, 2500), randint(600, 2900)),
-                  [self.visible_sprites, self.attackable_sprites], self.obstacle_sprites, self.damage_player)
+        self.player.reset_upgrade_flag()
+        self.memory.wave_ended(level)
+
+    def update_dynamic_sprites(self):
+        """
+        This method updates the sprites that change every frame: the player, the enemies and the transient effects.
+        Static tiles are only drawn, so they are skipped.
+        """
+
+        self.player_sprites.update()
+        self.local_enemies = self.collect_steering()
+        for enemy in self.local_enemies:
+            enemy.update()
+        self.effect_sprites.update()
+        self.projectiles.update()
+        if self.effects:
+            self.effects.update()
+
+    def enemy_update(self):
+        """
+        This method runs the AI of the enemies not steered by the AI worker, letting them react to the player.
+        Far enemies think at a reduced rate, as scheduled by the AIScheduler.
+        """
+
+        self.ai_scheduler.update(self.local_enemies, self.player)
+
+    def collect_steering(self):
+        """
+        This method applies the movement and the AI computed by the AI worker since the last frame.
+        If the worker fails, it is stopped and the enemies are updated in this process from then on.
+
+        :return: The enemies the worker did not steer, to update in this process.
+        """
+        if self.ai_worker is None:
+            return self.enemy_sprites.sprites()
+        try:
+            return self.ai_worker.collect(self.enemy_sprites)
+        except (OSError, EOFError):
+            self.stop_ai_worker()
+            return self.enemy_sprites.sprites()
+
+    def publish_steering(self):
+        """
+        This method sends the state of the enemies to the AI worker, which steers them for the next frame
+        while this frame is drawn.
+        """
+        if self.ai_worker is None:
+            return
+        try:
+            self.ai_worker.publish(self.enemy_sprites, self.player, self.world.resident)
+        except (OSError, EOFError):
+            self.stop_ai_worker()
+
+    def stop_ai_worker(self):
+        """
+        This method stops the AI worker, falling back to updating the enemies in this process.
+        """
+        self.ai_worker.close()
+        self.ai_worker = None
 
     def player_logic(self):
         """
-        This method handles the player logic. It checks for collisions between the player's attacks and the enemies,
-        and between the player and the collectable items. If a collision is detected, it calls the appropriate methods.
+        This method handles the player logic. It gathers the hits of the player's attacks and projectiles
+        on the enemies and resolves them in one batched pass, then plays the sounds and effects
+        of the resulting hits and deaths.
+        It also checks for collisions between the player and the collectable items.
         """
 
         if self.attack_sprites:
-            for attack_sprite in self.attack_sprites:
-                collision_sprites = pygame.sprite.spritecollide(attack_sprite, self.attackable_sprites, False)
-                if collision_sprites:
-                    for target_sprite in collision_sprites:
-                        target_sprite.get_damage(self.player, attack_sprite.sprite_type)
+            self.combat.gather(self.attack_sprites, self.attackable_sprites)
+        for target_sprite, damage in self.projectiles.collide(self.enemy_sprites, self.combat.hits):
+            self.combat.queue(target_sprite, 'projectile', damage)
+        for event, target_sprite, damage in self.combat.resolve(self.player):
+            if event == 'hit':
+                self.audio.play('hit')
+                if self.effects:
+                    self.effects.burst(target_sprite.hitbox.center, 'hit')
+                    self.effects.damage_number(target_sprite.hitbox.midtop, damage)
+            elif event == 'death':
+                target_sprite.kill()
+                self.enemies_killed += 1
+                self.audio.play('death')
+                if self.effects:
+                    self.effects.burst(target_sprite.hitbox.center, 'death')
         if self.collectable_sprites:
             for collectable_sprite in self.collectable_sprites:
                 collision_sprites = pygame.sprite.spritecollide(collectable_sprite, self.player_sprites, False)
                 if collision_sprites:
                     for target_sprite in collision_sprites:
                         self.player.health += 30
-                        collectable_sprite.kill()
-                        self.haps.play()
+                        self.world.eat_food(collectable_sprite)
+                        self.audio.play('haps')
 
     def damage_player(self, amount):
         """
@@ -167,99 +351,134 @@ class Level:
 
         if self.player.vulnerable:
             self.player.health -= amount
-            self.player_hit_sound.play()
-            self.player.vulnerable = False
-            self.player.hurt_time = pygame.time.get_ticks()
+            self.audio.play('player_hit')
+            self.player.make_invulnerable(self.player.invincibility_duration)
 
-    def show_game_over(self):
+    def end_game(self, outcome, sound):
         """
-        This method displays the game over screen. It fills the display surface with black, renders the game over text,
-        and plays the game over sound. It then waits for 5 seconds before quitting the game.
+        This method ends the game. It stops the music, plays the sound of the outcome and records the outcome,
+        so the end screen is shown next. The AI worker, if any, is stopped right away rather than
+        when the level is collected.
+
+        :param outcome: The outcome of the game ('game_over' or 'win').
+        :param sound: The name of the sound to play.
         """
 
-        game_over_font = pygame.font.Font(None, 100)
-        game_over_text = game_over_font.render("Game Over", True, (255, 0, 0))
-        game_over_rect = game_over_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+        self.outcome = outcome
+        self.audio.stop_music()
+        self.audio.play(sound)
+        if self.ai_worker is not None:
+            self.stop_ai_worker()
 
-        self.display_surface.fill((0, 0, 0))
-        self.display_surface.blit(game_over_text, game_over_rect)
-        self.background_music.stop()
-        self.gameOver.play()
-        pygame.display.flip()
+    def check_win(self):
+        """
+        This method checks if the player has won the game. If the level is WIN_LEVEL, it ends the game with a win.
+        """
+
+        if self.waves.level == WIN_LEVEL and self.outcome is None:
+            self.end_game('win', 'victory')
 
-        # Wait for 5 seconds
-        pygame.time.wait(5000)
+    def check_death(self):
+        """
+        This method checks if the player has died. If the player's health is 0 or less,
+        it ends the game with a game over.
+        """
 
-        pygame.quit()
-        sys.exit()
+        if self.player.health <= 0 and self.outcome is None:
+            self.end_game('game_over', 'game_over')
 
-    def show_win(self):
+    def record_frame_time(self, frame_time):
         """
-        This method displays the win screen. It fills the display surface with black, renders the win text,
-        and plays the victory sound. It then waits for 5 seconds before quitting the game.
+        This method records how long the last frame took, letting the camera adapt its render scale.
+
+        :param frame_time: The time the frame took in milliseconds.
         """
 
-        win_font = pygame.font.Font(UI_FONT, 100)
-        win_text = win_font.render("You WON!!!", True, (0, 255, 0))
-        win_rect = win_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+        self.visible_sprites.scaler.record(frame_time)
 
-        self.display_surface.fill((0, 0, 0))
-        self.display_surface.blit(win_text, win_rect)
-        self.background_music.stop()
-        self.victory.play()
-        pygame.display.flip()
+    @property
+    def frozen(self):
+        """
+        This property tells if the world is frozen, which is the case while the game is paused
+        or the upgrade menu is shown.
 
-        # Wait for 5 seconds
-        pygame.time.wait(5000)
-        pygame.quit()
-        sys.exit()
+        :return: True if the world is frozen, False otherwise.
+        """
 
-    def check_win(self):
+        return self.game_paused or not self.player.upgrade_performed
+
+    def toggle_pause(self):
         """
-        This method checks if the player has won the game. If the level is 10, it calls the show_win method.
+        This method pauses the game, or resumes it if it is paused.
         """
 
-        if settings.LEVEL == 10:
-            self.show_win()
+        self.game_paused = not self.game_paused
 
-    def check_death(self):
+    def draw(self):
         """
-        This method checks if the player has died. If the player's health is 0 or less,
-        it calls the show_game_over method.
+        This method draws the world, the projectiles, the effects, the UI and the minimap.
+        The projectiles and the effects share one draw list, submitted over the world with a single blits call.
+        """
+
+        self.visible_sprites.custom_draw(self.player)
+        self.projectiles.draw(self.overlay, self.visible_sprites.offset)
+        self.effects.draw(self.overlay, self.visible_sprites.offset)
+        self.overlay.submit(self.display_surface)
+        self.ui.draw(self.player, self.waves)
+        self.minimap.draw(self.player, self.enemy_sprites)
+
+    def capture_backdrop(self):
+        """
+        This method draws the world once and keeps a dimmed copy of it, shown while the world is frozen.
         """
 
-        if self.player.health <= 0:
-            self.show_game_over()
+        self.draw()
+        self.backdrop = self.renderer.snapshot()
+        self.backdrop.fill(BACKDROP_DIM, special_flags=pygame.BLEND_RGB_MULT)
 
     def run(self):
         """
-        This method runs the game logic. It updates the sprites, checks for player death and win, and draws the UI.
-        If the game is not paused, it continues the game logic.
+        This method runs the game logic. It draws the world and the UI, updates the sprites,
+        and checks for player death and win.
+        While the game is paused or the upgrade menu is shown, nothing moves, so only a dimmed snapshot
+        of the world is drawn under the menu.
         """
 
-        self.visible_sprites.custom_draw(self.player)
-        self.ui.draw(self.player)
+        if self.frozen:
+            if self.backdrop is None:
+                self.capture_backdrop()
+            self.renderer.blit(self.backdrop, (0, 0))
 
-        if not self.game_paused:  # Check if the game is not paused
-            if not self.player.upgrade_performed:
-                self.upgrade.display()
+            if self.game_paused:  # Check if the game is paused
+                self.ui.show_paused()
             else:
-                # Continue the game logic
-                if len(settings.enemies) == 0:
-                    settings.LEVEL += 1
-                    settings.WAVE_SIZE += 5
-                    for i in range(settings.WAVE_SIZE):
-                        settings.enemies.append(choice(list(enemy_data.keys())))
-                    self.create_enemy()
+                self.upgrade.display()
+        else:
+            self.backdrop = None
+            self.draw()
+            self.step()
+
+        self.audio.end_frame()
+
+    def step(self):
+        """
+        This method advances the game logic by one frame without drawing anything. It fires the expired timers,
+        streams the world around the player, spawns enemies, updates the sprites, runs the enemy AI
+        and the player logic, and checks for player death and win. Last, the AI worker, if any, is sent the enemies
+        to steer for the next frame.
+        """
 
-                    # Reset the upgrade flag in the player
-                    self.player.reset_upgrade_flag()
+        self.timers.update()
+        self.world.update(self.player.rect.center, self.player.direction)
+        self.create_enemy(self.waves.update())
 
-                self.visible_sprites.update()
-                self.visible_sprites.enemy_update(self.player)
-                self.player_logic()
-                self.check_death()
-                self.check_win()
+        self.animation_clock.tick()
+        self.update_dynamic_sprites()
+        self.enemy_update()
+        self.player_logic()
+        self.check_death()
+        self.check_win()
+        self.publish_steering()
 
 
 class YSortCameraGroup(pygame.sprite.Group):
@@ -272,44 +491,83 @@ class YSortCameraGroup(pygame.sprite.Group):
     def __init__(self):
         """
         This method initializes a YSortCameraGroup object. It calls the superclass's __init__ method and
-        sets up the display surface,
-        half width, half height, and offset.
+        sets up the renderer, the display surface, half width, half height, offset, the draw list,
+        the resolution scaler with its world surfaces, and the floor renderer.
         """
 
         super().__init__()
-        self.display_surface = pygame.display.get_surface()
+        self.renderer = get_renderer()
+        self.display_surface = self.renderer.surface
         self.half_width = self.display_surface.get_rect().centerx
         self.half_height = self.display_surface.get_rect().centery
         self.offset = pygame.math.Vector2()
+        self.draw_list = DrawList()
 
-        # creating the floor
-        self.floor_surface = pygame.image.load('graphics/map2.png').convert()
-        self.floor_rect = self.floor_surface.get_rect(topleft=(0, 0))
+        # adaptive resolution, the world is drawn on a smaller surface when frames are over budget,
+        # only needed by the software renderer
+        self.scaler = ResolutionScaler(RENDER_SCALES if ADAPTIVE_RESOLUTION and self.renderer.software else (1,))
+        self.world_surfaces = {}
+
+        # the floor, drawn from the floor layers of the map
+        self.floor = FloorRenderer()
 
     def custom_draw(self, player):
         """
-        This method draws the sprites in the group. It first draws the floor,
+        This method draws the sprites in the group. It first draws the visible floor chunks,
         then sorts the sprites by their y-coordinate and draws them.
         It also updates the offset based on the player's position.
+        Below native scale, the world is drawn on a smaller surface that is then stretched over the display.
         """
 
         self.offset.x = player.rect.centerx - self.half_width
         self.offset.y = player.rect.centery - self.half_height
 
-        # drawing the floor
-        self.display_surface.blit(self.floor_surface, self.floor_rect.topleft - self.offset)
+        scale = self.scaler.scale
+        if scale == 1:
+            self.draw_world(self.renderer)
+        else:
+            world_surface = self.get_world_surface(scale)
+            self.draw_world(world_surface, scale)
+            pygame.transform.scale(world_surface, self.display_surface.get_size(), self.display_surface)
 
-        for sprite in sorted(self.sprites(), key=lambda sprite: sprite.rect.centery):
-            offset_pos = sprite.rect.topleft - self.offset
-            self.display_surface.blit(sprite.image, offset_pos)
+    def draw_world(self, surface, scale=1):
+        """
+        This method draws the visible floor chunks and the y-sorted sprites on a surface. The camera offset
+        is turned into integers once, every image is queued on the draw list with its integer position,
+        and the whole world is submitted with a single blits call.
 
-    def enemy_update(self, player):
+        :param surface: The surface or renderer to draw on.
+        :param scale: The scale the world is drawn at.
         """
-        This method updates the enemies in the group.
-        It gets the enemy sprites from the group and calls their enemy_update method.
+
+        offset_x = int(self.offset.x)
+        offset_y = int(self.offset.y)
+        floor = self.floor.visible(pygame.Rect(offset_x, offset_y, WIDTH, HEIGHT))
+        sprites = sorted(self.sprites(), key=attrgetter('rect.centery'))
+        draw_list = self.draw_list
+
+        if scale == 1:
+            draw_list.extend([(image, (x - offset_x, y - offset_y)) for image, (x, y) in floor])
+            draw_list.extend([(sprite.image, (sprite.rect.x - offset_x, sprite.rect.y - offset_y))
+                              for sprite in sprites])
+        else:
+            scaled = self.scaler.scaled
+            draw_list.extend([(scaled(image), (round((x - offset_x) * scale), round((y - offset_y) * scale)))
+                              for image, (x, y) in floor])
+            draw_list.extend([(scaled(sprite.image), (round((sprite.rect.x - offset_x) * scale),
+                                                      round((sprite.rect.y - offset_y) * scale)))
+                              for sprite in sprites])
+        draw_list.submit(surface)
+
+    def get_world_surface(self, scale):
+        """
+        This method gets the surface the world is drawn on at a reduced scale, creating it the first time.
+
+        :param scale: The scale the world is drawn at.
+        :return: The world surface.
         """
 
-        enemy_sprites = [sprite for sprite in self.sprites() if hasattr(sprite, 'sprite_type')
-                         and sprite.sprite_type == 'enemy']
-        for enemy in enemy_sprites:
-            enemy.enemy_update(player)
+        if scale not in self.world_surfaces:
+            width, height = self.display_surface.get_size()
+            self.world_surfaces[scale] = pygame.Surface((round(width * scale), round(height * scale))).convert()
+        return self.world_surfaces[scale]
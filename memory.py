@@ -0,0 +1,211 @@
+import gc
+import os
+import time
+import tracemalloc
+from collections import Counter, deque
+import pygame
+from settings import *
+
+
+class GCTimer:
+    """
+    The GCTimer class measures how long every garbage collection pauses the game, through gc.callbacks.
+    It is installed once per process and keeps the most recent pauses.
+
+    :param history: The number of pauses kept.
+    """
+
+    def __init__(self, history=GC_PAUSE_HISTORY):
+        """
+        This method initializes a GCTimer object.
+
+        :param history: The number of pauses kept.
+        """
+        self.pauses = deque(maxlen=history)
+        self.start_time = None
+        self.installed = False
+
+    def install(self):
+        """
+        This method starts measuring the collections, unless it already does.
+        """
+        if not self.installed:
+            gc.callbacks.append(self.callback)
+            self.installed = True
+
+    def callback(self, phase, info):
+        """
+        This method is called by the garbage collector before and after every collection.
+
+        :param phase: 'start' or 'stop'.
+        :param info: A dictionary with the generation being collected.
+        """
+        if phase == 'start':
+            self.start_time = time.perf_counter()
+        elif self.start_time is not None:
+            self.pauses.append((info['generation'], (time.perf_counter() - self.start_time) * 1000))
+            self.start_time = None
+
+    def summary(self):
+        """
+        This method sums up the recorded pauses per generation and forgets them.
+
+        :return: A dictionary with the count, total and longest pause in milliseconds of every generation.
+        """
+        summary = {}
+        for generation, duration in self.pauses:
+            count, total, longest = summary.get(generation, (0, 0, 0))
+            summary[generation] = (count + 1, total + duration, max(longest, duration))
+        self.pauses.clear()
+        return {generation: {'count': count, 'total_ms': round(total, 3), 'max_ms': round(longest, 3)}
+                for generation, (count, total, longest) in sorted(summary.items())}
+
+
+gc_timer = GCTimer()
+
+
+class MemoryMonitor:
+    """
+    The MemoryMonitor class records how the game's memory behaves from wave to wave. At every wave boundary,
+    it counts the live objects of the tracked types, sums up the garbage collection pauses since the previous wave
+    and, when tracing is on, compares a tracemalloc snapshot with the previous one.
+    Surfaces are not tracked by the garbage collector, so they are found through the objects referring to them.
+
+    With the 'deferred' policy, the objects created at startup are frozen, so collections never scan them again,
+    and automatic full collections are turned off. The full collection then runs at every wave boundary,
+    once the upgrade screen is shown, instead of in the middle of a wave. It unfreezes everything first,
+    so frozen objects that died are freed too, and freezes the survivors again afterwards.
+
+    :param record: Whether the memory is recorded at the wave boundaries.
+    :param trace: Whether tracemalloc snapshots are taken, when recording.
+    :param policy: The garbage collection policy ('default' or 'deferred').
+    :param log_path: The file the records are appended to, or None.
+    """
+
+    def __init__(self, record=MEMORY_RECORD, trace=MEMORY_TRACE, policy=GC_POLICY, log_path=MEMORY_LOG):
+        """
+        This method initializes a MemoryMonitor object. It installs the pause timer, starts tracing if asked
+        and applies the collection policy. It is meant to be created once the level's startup objects exist.
+
+        :param record: Whether the memory is recorded at the wave boundaries.
+        :param trace: Whether tracemalloc snapshots are taken, when recording.
+        :param policy: The garbage collection policy ('default' or 'deferred').
+        :param log_path: The file the records are appended to, or None.
+        """
+        self.record = record
+        self.trace = record and trace
+        self.policy = policy
+        self.log_path = log_path
+        self.records = []
+        self.snapshot = None
+        self.ended_wave = None  # the wave ended since the last wave boundary
+
+        if record:
+            gc_timer.install()
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(MEMORY_TRACE_FRAMES)
+            self.snapshot = tracemalloc.take_snapshot()
+        self.apply_policy()
+
+    def apply_policy(self):
+        """
+        This method applies the collection policy. The deferred policy first unfreezes the objects frozen
+        for a previous level, so they can be freed, then freezes everything alive now.
+        """
+        if self.policy != 'deferred':
+            return
+        gc.unfreeze()
+        gc.collect()
+        gc.freeze()
+        threshold0, threshold1, _ = gc.get_threshold()
+        gc.set_threshold(threshold0, threshold1, GC_DEFERRED_THRESHOLD)
+
+    @staticmethod
+    def count_objects():
+        """
+        This method counts the live objects of the tracked types and the memory used by the surfaces' pixels.
+
+        :return: A dictionary with the count of every tracked type and the surface bytes.
+        """
+        counts = Counter()
+        surfaces = {}
+        for obj in gc.get_objects():
+            name = type(obj).__name__
+            if name in MEMORY_TRACKED_TYPES:
+                counts[name] += 1
+            for referent in gc.get_referents(obj):
+                if type(referent) is pygame.Surface:
+                    surfaces[id(referent)] = referent
+        counts['Surface'] = len(surfaces)
+        counts['surface_bytes'] = sum(surface.get_bytesize() * surface.get_width() * surface.get_height()
+                                      for surface in surfaces.values())
+        return dict(counts)
+
+    def wave_ended(self, wave):
+        """
+        This method notes that a wave ended. Nothing is counted or collected yet, the wave's last frame
+        is still being played, so the work waits for wave_boundary.
+
+        :param wave: The wave that just ended.
+        """
+        self.ended_wave = wave
+
+    def wave_boundary(self):
+        """
+        This method records the memory of the wave that ended, once the game is frozen on the upgrade screen.
+        With the deferred policy, it also runs the postponed full collection. It does nothing if no wave ended
+        since the last call.
+
+        :return: The record of the wave, or None when not recording or no wave ended.
+        """
+        wave = self.ended_wave
+        if wave is None:
+            return None
+        self.ended_wave = None
+        if self.policy == 'deferred':
+            gc.unfreeze()
+            gc.collect()
+        record = self.take_record(wave) if self.record else None
+        if self.policy == 'deferred':
+            gc.freeze()
+        return record
+
+    def take_record(self, wave):
+        """
+        This method counts the objects, sums up the collection pauses, compares the tracemalloc snapshots
+        and logs the result.
+
+        :param wave: The wave that just ended.
+        :return: The record of the wave.
+        """
+
+        record = {'wave': wave, 'objects': self.count_objects(), 'gc_pauses': gc_timer.summary()}
+        if self.trace:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            record['traced_bytes'] = current
+            record['traced_peak_bytes'] = peak
+            record['top_growth'] = [str(stat) for stat in
+                                    snapshot.compare_to(self.snapshot, 'lineno')[:MEMORY_TOP_STATS]]
+            self.snapshot = snapshot
+
+        self.records.append(record)
+        self.log(record)
+        return record
+
+    def log(self, record):
+        """
+        This method appends a record to the log file.
+
+        :param record: The record to write.
+        """
+        if self.log_path is None:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or '.', exist_ok=True)
+        with open(self.log_path, 'a') as file:
+            file.write(f"wave {record['wave']}: objects {record['objects']}, gc pauses {record['gc_pauses']}\n")
+            if 'traced_bytes' in record:
+                file.write(f"  traced {record['traced_bytes']} bytes, peak {record['traced_peak_bytes']} bytes\n")
+                for line in record['top_growth']:
+                    file.write(f'  {line}\n')
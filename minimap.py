@@ -0,0 +1,106 @@
+from itertools import chain
+import numpy as np
+import pygame
+from settings import *
+from support import import_csv
+from renderer import get_renderer
+
+
+class Minimap:
+    """
+    The Minimap class represents the minimap in the corner of the screen.
+    The terrain is scaled from the floor overview once, with the blocked tiles darkened.
+    The enemies are plotted with a single bulk pixel write instead of one draw call per enemy, and only every
+    `interval` frames, since gathering the positions of thousands of enemies is the costly part.
+    In between, the plotted frame is reused and only the player's marker moves.
+
+    :param world_size: The width and height of the world in pixels.
+    :param floor: The overview of the floor, with one pixel per tile.
+    :param size: The width and height of the minimap in pixels.
+    :param interval: The number of frames between two plots of the enemies.
+    """
+
+    def __init__(self, world_size, floor, size=MINIMAP_SIZE, interval=MINIMAP_ENEMY_INTERVAL):
+        """
+        This method initializes a Minimap object. It builds the terrain image and the frame surface the
+        minimap is drawn on each frame.
+
+        :param world_size: The width and height of the world in pixels.
+        :param floor: The overview of the floor, with one pixel per tile.
+        :param size: The width and height of the minimap in pixels.
+        :param interval: The number of frames between two plots of the enemies.
+        """
+        self.display_surface = get_renderer().surface
+        self.size = size
+        self.scale = size / world_size
+        self.interval = interval
+        self.countdown = 0  # frames until the enemies are plotted again
+
+        self.terrain = self.create_terrain(floor)
+        self.frame = self.terrain.copy()
+        self.rect = self.frame.get_rect(topright=(WIDTH - 10, 10))
+        self.enemy_color = self.frame.map_rgb(MINIMAP_ENEMY_COLOR)
+
+    def create_terrain(self, floor):
+        """
+        This method scales the floor overview to the minimap size and darkens the tiles
+        of the collision layer.
+
+        :param floor: The overview of the floor, with one pixel per tile.
+        :return: The terrain surface.
+        """
+        terrain = pygame.transform.smoothscale(floor, (self.size, self.size))
+
+        # tile under every minimap pixel
+        blocks = np.array(import_csv('map/map2_FloorBlocks.csv'), dtype=int) != -1
+        cells = (np.arange(self.size) / self.scale // TILESIZE).astype(int)
+        cells = np.clip(cells, 0, min(blocks.shape) - 1)
+        blocked = blocks[np.ix_(cells, cells)].T  # surfarray indexes pixels as [x, y]
+
+        pixels = pygame.surfarray.pixels3d(terrain)
+        pixels[blocked] //= 3
+        del pixels  # unlock the surface
+        return terrain
+
+    def plot_enemies(self, enemies):
+        """
+        This method redraws the frame: it copies the terrain and plots every enemy as a 2x2 dot in bulk.
+
+        :param enemies: The enemy sprites.
+        """
+        self.frame.blit(self.terrain, (0, 0))
+
+        if enemies:
+            centers = chain.from_iterable([enemy.rect.center for enemy in enemies])
+            positions = np.fromiter(centers, dtype=np.int32, count=len(enemies) * 2).reshape(-1, 2)
+            positions = np.clip((positions * self.scale).astype(np.int32), 0, self.size - 2)
+            xs, ys = positions[:, 0], positions[:, 1]
+
+            pixels = pygame.surfarray.pixels2d(self.frame)
+            pixels[xs, ys] = self.enemy_color
+            pixels[xs + 1, ys] = self.enemy_color
+            pixels[xs, ys + 1] = self.enemy_color
+            pixels[xs + 1, ys + 1] = self.enemy_color
+            del pixels  # unlock the surface
+
+    def draw(self, player, enemies):
+        """
+        This method draws the minimap. It plots the enemies again when they are due, draws the frame
+        and marks the player over it, every frame.
+
+        :param player: The player object.
+        :param enemies: The enemy sprites.
+        """
+        if self.countdown <= 0:
+            self.plot_enemies(enemies)
+            self.countdown = self.interval
+        self.countdown -= 1
+
+        self.display_surface.blit(self.frame, self.rect)
+        player_pos = (self.rect.x + int(player.rect.centerx * self.scale),
+                      self.rect.y + int(player.rect.centery * self.scale))
+        clip = self.display_surface.get_clip()
+        self.display_surface.set_clip(self.rect)  # the marker stays inside the minimap, like on its frame
+        pygame.draw.circle(self.display_surface, MINIMAP_PLAYER_COLOR, player_pos, 3)
+        self.display_surface.set_clip(clip)
+        pygame.draw.rect(self.display_surface, 'black', self.rect.inflate(6, 6), 3)
@@ -2,29 +2,39 @@ import pygame
 from settings import *
 from support import *
 from characters import Characters
+from assets import preloader
 
 
 class Player(Characters):
     """
     The Player class represents the player character in the game. It is a subclass of Characters.
     It has methods for importing player assets, handling player input, getting the player's status,
-    handling player attacks, handling cooldowns, animating the player, getting the player's full attack damage,
+    handling player attacks, animating the player, getting the player's full attack damage,
     resetting the upgrade flag, and updating the player.
+    Without manual input, the keyboard and the mouse are ignored and the player is driven with steer and aim,
+    as in headless simulations.
+    The attack cycle and the cooldowns are timers on the level's timer wheel.
     """
 
-    def __init__(self, pos, groups, obstacle_sprites, create_attack, destroy_weapon):
+    def __init__(self, pos, groups, obstacles, create_attack, destroy_weapon, create_projectile,
+                 timers, manual_input=True):
         """
         This method initializes a Player object. It calls the superclass's __init__ method and sets up the sprite type,
-        image, and rect based on the player's status. It also sets up the player's stats, attack properties, and sounds.
+        image, and rect based on the player's status. It also sets up the player's stats and attack properties.
 
         :param pos: The initial position of the player.
         :param groups: The groups that the player belongs to.
-        :param obstacle_sprites: The sprites that represent obstacles.
+        :param obstacles: The CollisionGrid of the obstacles.
         :param create_attack: The function to call to create an attack.
         :param destroy_weapon: The function to call to destroy a weapon.
+        :param create_projectile: The function to call to fire a projectile.
+        :param timers: The level's TimerWheel.
+        :param manual_input: Whether the player is controlled with the keyboard and the mouse.
         """
         super().__init__(groups)
-        self.image = pygame.image.load('graphics/player/right_idle/idle_right.png').convert_alpha()
+        self.timers = timers
+        self.manual_input = manual_input
+        self.image = preloader.image('graphics/player/right_idle/idle_right.png')
         self.rect = self.image.get_rect(topleft=pos)
         self.hitbox = self.rect.inflate(-6, -26)
 
@@ -32,15 +42,19 @@ class Player(Characters):
         self.import_player_assets()
         self.status = 'right'
 
-        self.attacking = True
         self.attack_cooldown = 400
         self.attack_duration = 400
-        self.attack_time = pygame.time.get_ticks()
         self.reactivation_cooldown = 500
         self.create_attack = create_attack
         self.destroy_weapon = destroy_weapon
         self.weapon_index = 0
         self.weapon = list(weapon_data.keys())[self.weapon_index]
+        self.start_attack()
+
+        # projectiles
+        self.create_projectile = create_projectile
+        self.can_shoot = True
+        self.aim = None
 
         # stats
         self.stats = {'health': 150, 'attack': 10, 'speed': 5}
@@ -50,16 +64,11 @@ class Player(Characters):
 
         # damage timer
         self.vulnerable = True
-        self.hurt_time = None
         self.invincibility_duration = 500
 
-        self.obstacle_sprites = obstacle_sprites
+        self.obstacles = obstacles
         self.upgrade_performed = False
 
-        # sounds
-        self.weapon_attack_sound = pygame.mixer.Sound('sounds/tornadoSound.mp3')
-        self.weapon_attack_sound.set_volume(0.4)
-
     def import_player_assets(self):
         """
         This method imports the sprites for the player.
@@ -76,27 +85,50 @@ class Player(Characters):
     def input(self):
         """
         This method handles player input.
-        It checks if the WSAD keys are pressed and sets the player's direction and status accordingly.
+        It checks if the WSAD keys are pressed and steers the player accordingly.
+        While the left mouse button is held, the player aims at the mouse cursor.
+        The player is always in the middle of the screen.
         """
         keys = pygame.key.get_pressed()
 
         if keys[pygame.K_w]:
-            self.direction.y = -1
-            self.status = 'up'
+            y = -1
         elif keys[pygame.K_s]:
-            self.direction.y = 1
-            self.status = 'down'
+            y = 1
         else:
-            self.direction.y = 0
+            y = 0
 
         if keys[pygame.K_d]:
-            self.direction.x = 1
-            self.status = 'right'
+            x = 1
         elif keys[pygame.K_a]:
-            self.direction.x = -1
-            self.status = 'left'
+            x = -1
         else:
-            self.direction.x = 0
+            x = 0
+
+        self.steer(x, y)
+
+        self.aim = None
+        if pygame.mouse.get_pressed()[0]:
+            aim = pygame.math.Vector2(pygame.mouse.get_pos()) - (WIDTH // 2, HEIGHT // 2)
+            if aim.length_squared() != 0:
+                self.aim = aim.normalize()
+
+    def steer(self, x, y):
+        """
+        This method sets the player's direction and status.
+
+        :param x: The horizontal direction, -1 for left, 1 for right and 0 for none.
+        :param y: The vertical direction, -1 for up, 1 for down and 0 for none.
+        """
+        self.direction.update(x, y)
+        if y < 0:
+            self.status = 'up'
+        elif y > 0:
+            self.status = 'down'
+        if x > 0:
+            self.status = 'right'
+        elif x < 0:
+            self.status = 'left'
 
     def get_status(self):
         """
@@ -116,36 +148,40 @@ class Player(Characters):
             if 'attack' in self.status:
                 self.status = self.status.replace('_attack', '')
 
-    def attack(self):
+    def start_attack(self):
         """
-        This method handles player attacks. If the player can attack, it sets the attack time and creates an attack.
-        If the player cannot attack, it checks if the reactivation cooldown has passed and allows the player to attack.
+        This method starts an attack and registers its end after the attack duration.
         """
-        current_time = pygame.time.get_ticks()
+        self.attacking = True
+        self.timers.schedule(self.attack_duration, self.end_attack)
 
-        if not self.attacking and current_time - self.attack_time >= self.reactivation_cooldown + \
-                weapon_data[self.weapon]['cooldown']:
-            self.attacking = True
-            self.attack_time = current_time
+    def end_attack(self):
+        """
+        This method ends an attack. It replaces the weapon and registers the next attack
+        after the reactivation cooldown and the weapon's cooldown.
+        """
+        self.destroy_weapon()
+        self.attacking = False
+        self.create_attack()
+        self.timers.schedule(self.reactivation_cooldown + weapon_data[self.weapon]['cooldown'], self.start_attack)
 
-        if self.attacking:
-            if current_time - self.attack_time > self.attack_duration:
-                self.destroy_weapon()
-                self.attacking = False
-                self.attack_time = current_time
-                self.create_attack()
-                self.weapon_attack_sound.play()
+    def shoot(self):
+        """
+        This method fires a projectile in the aimed direction while the player aims,
+        at most once per projectile cooldown.
+        """
+        if self.aim is None or not self.can_shoot:
+            return
 
-    def cooldown(self):
+        self.can_shoot = False
+        self.timers.schedule(projectile_data['cooldown'], self.reload)
+        self.create_projectile(self.aim)
+
+    def reload(self):
         """
-        This method handles the player's cooldowns.
-        If the player is not vulnerable, it checks if the invincibility duration has passed
-        and makes the player vulnerable.
+        This method allows the player to shoot again, once the projectile cooldown has passed.
         """
-        current_time = pygame.time.get_ticks()
-        if not self.vulnerable:
-            if current_time - self.hurt_time >= self.invincibility_duration:
-                self.vulnerable = True
+        self.can_shoot = True
 
     def animate(self):
         """
@@ -170,6 +206,15 @@ class Player(Characters):
         weapon_damage = weapon_data[self.weapon]['damage']
         return base_damage + weapon_damage
 
+    def get_full_projectile_damage(self):
+        """
+        This method gets the player's full projectile damage. It adds half of the player's attack stat
+        to the projectile's damage.
+
+        :return: The player's full projectile damage.
+        """
+        return self.stats['attack'] // 2 + projectile_data['damage']
+
     def get_value_by_index(self, index):
         """
         This method gets the value of a player stat by its index.
@@ -179,6 +224,16 @@ class Player(Characters):
         """
         return list(self.stats.values())[index]
 
+    def upgrade(self, index):
+        """
+        This method upgrades a player stat by 20%, up to its maximum, and marks the upgrade as performed.
+
+        :param index: The index of the stat.
+        """
+        attribute = list(self.stats.keys())[index]
+        self.stats[attribute] = min(self.stats[attribute] * 1.2, self.max_stats[attribute])
+        self.upgrade_performed = True
+
     def reset_upgrade_flag(self):
         """
         This method resets the player's upgrade flag. It sets the upgrade_performed attribute to False.
@@ -188,11 +243,11 @@ class Player(Characters):
     def update(self):
         """
         This method updates the player.
-        It handles player input, player attacks, cooldowns, player movement, player status, and player animation.
+        It handles player input, projectiles, player movement, player status, and player animation.
         """
-        self.input()
-        self.attack()
-        self.cooldown()
+        if self.manual_input:
+            self.input()
+        self.shoot()
         self.move(self.speed)
         self.get_status()
         self.animate()
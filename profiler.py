@@ -0,0 +1,193 @@
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from settings import *
+
+
+class SamplingProfiler:
+    """
+    The SamplingProfiler class records where the main thread spends its time. A background thread looks at
+    the main thread's Python stack every few milliseconds for a limited time and counts how often every stack
+    is seen, so the game itself is not slowed down by tracing every call.
+    The sampling thread needs the GIL to look at the stack. During a capture, the GIL switch interval is lowered,
+    so samples are not only taken where the main thread releases the GIL on its own, such as in blits.
+    The result is written as collapsed stacks, for flamegraph tools, and as a speedscope profile.
+
+    :param interval: The time between two samples in seconds.
+    :param directory: The directory the profiles are written to.
+    """
+
+    def __init__(self, interval=PROFILE_INTERVAL, directory=PROFILE_DIR):
+        """
+        This method initializes a SamplingProfiler object.
+
+        :param interval: The time between two samples in seconds.
+        :param directory: The directory the profiles are written to.
+        """
+        self.interval = interval
+        self.directory = directory
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.stacks = Counter()
+        self.weights = Counter()
+        self.frame_times = []
+        self.start_time = 0
+        self.end_time = 0
+        self.switch_interval = sys.getswitchinterval()
+
+    @property
+    def running(self):
+        """
+        This property tells if the profiler is sampling.
+
+        :return: True if the profiler is sampling, False otherwise.
+        """
+        return self.thread is not None and self.thread.is_alive()
+
+    @property
+    def finished(self):
+        """
+        This property tells if a capture ended and was not written yet.
+
+        :return: True if the capture ended, False otherwise.
+        """
+        return self.thread is not None and not self.thread.is_alive()
+
+    def start(self, duration=PROFILE_DURATION):
+        """
+        This method starts sampling the calling thread for the given time.
+
+        :param duration: The time to sample for in seconds.
+        """
+        if self.running:
+            return
+        self.stacks.clear()
+        self.weights.clear()
+        self.frame_times = []
+        self.stop_event.clear()
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(PROFILE_SWITCH_INTERVAL)
+        self.thread = threading.Thread(target=self.sample, args=(threading.get_ident(), duration), daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """
+        This method stops sampling before the end of the capture and waits for the sampling thread.
+        """
+        if self.running:
+            self.stop_event.set()
+            self.thread.join()
+
+    def sample(self, thread_id, duration):
+        """
+        This method runs in the sampling thread. It samples the stack of a thread until the capture ends.
+        Every stack is weighted with the time since the previous sample. The switch interval is restored at the end.
+
+        :param thread_id: The identifier of the sampled thread.
+        :param duration: The time to sample for in seconds.
+        """
+        self.start_time = last_time = time.perf_counter()
+        end_time = self.start_time + duration
+        while not self.stop_event.wait(self.interval):
+            now = time.perf_counter()
+            frame = sys._current_frames().get(thread_id)
+            if frame is None or now >= end_time:
+                break
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((getattr(code, 'co_qualname', code.co_name), code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            del frame
+            stack = tuple(reversed(stack))
+            self.stacks[stack] += 1
+            self.weights[stack] += (now - last_time) * 1000
+            last_time = now
+        self.end_time = time.perf_counter()
+        sys.setswitchinterval(self.switch_interval)
+
+    def record_frame(self, frame_time):
+        """
+        This method records how long a frame took during the capture.
+
+        :param frame_time: The time the frame took in milliseconds.
+        """
+        if self.running:
+            self.frame_times.append(frame_time)
+
+    def frame_stats(self):
+        """
+        This method gets the statistics of the frame times recorded during the capture.
+
+        :return: A dictionary with the number of frames and the mean, 95th percentile and worst frame time.
+        """
+        frame_times = sorted(self.frame_times)
+        if not frame_times:
+            return {'frames': 0, 'mean_ms': 0, 'p95_ms': 0, 'max_ms': 0}
+        return {'frames': len(frame_times),
+                'mean_ms': round(sum(frame_times) / len(frame_times), 2),
+                'p95_ms': frame_times[min(len(frame_times) - 1, int(len(frame_times) * 0.95))],
+                'max_ms': frame_times[-1]}
+
+    @staticmethod
+    def frame_name(frame):
+        """
+        This method gets the name of a stack frame as shown in the profiles.
+
+        :param frame: The (function, file, line) of the frame.
+        :return: The name of the frame.
+        """
+        function, filename, line = frame
+        return f'{function} ({os.path.basename(filename)}:{line})'
+
+    def write(self, tags):
+        """
+        This method writes the capture as a collapsed stacks file and a speedscope file.
+        The tags and the frame statistics are part of the file names and of the speedscope profile.
+
+        :param tags: A dictionary describing the game state during the capture, such as the wave and enemy count.
+        :return: The paths of the written files.
+        """
+        self.stop()
+        self.thread = None
+        os.makedirs(self.directory, exist_ok=True)
+
+        tags = {**tags, **self.frame_stats()}
+        label = '-'.join(f'{key}{value}' for key, value in tags.items() if key in ('wave', 'enemies'))
+        base = os.path.join(self.directory, f"{time.strftime('%Y%m%d-%H%M%S')}{'-' + label if label else ''}")
+
+        # collapsed stacks, one line per stack with its sample count
+        collapsed_path = base + '.collapsed'
+        with open(collapsed_path, 'w') as file:
+            for stack, count in self.stacks.most_common():
+                file.write(';'.join(self.frame_name(frame) for frame in stack) + f' {count}\n')
+
+        # speedscope, the stacks weighted with the sampled time
+        frames = {}
+        samples = []
+        weights = []
+        for stack, weight in self.weights.items():
+            samples.append([frames.setdefault(frame, len(frames)) for frame in stack])
+            weights.append(round(weight, 3))
+        speedscope_path = base + '.speedscope.json'
+        profile = {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': [{'name': function, 'file': filename, 'line': line}
+                                  for function, filename, line in frames]},
+            'profiles': [{'type': 'sampled',
+                          'name': ', '.join(f'{key} {value}' for key, value in tags.items()),
+                          'unit': 'milliseconds',
+                          'startValue': 0,
+                          'endValue': round(sum(weights), 3),
+                          'samples': samples,
+                          'weights': weights}],
+            'name': 'Survivors',
+            'exporter': 'survivors-profiler'}
+        with open(speedscope_path, 'w') as file:
+            json.dump(profile, file)
+
+        return collapsed_path, speedscope_path
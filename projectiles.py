@@ -0,0 +1,145 @@
+import numpy as np
+import pygame
+from settings import *
+from support import import_csv
+
+
+class ProjectileSystem:
+    """
+    The ProjectileSystem class handles the player's projectiles. Projectiles are not sprites:
+    their positions, velocities, remaining lifetimes and damage live in preallocated NumPy arrays,
+    so they are moved, culled and collided with the enemies in bulk, and drawn from one shared surface
+    through a draw list.
+
+    :param capacity: The maximum number of projectiles alive at the same time.
+    """
+
+    def __init__(self, capacity=PROJECTILE_CAPACITY):
+        """
+        This method initializes a ProjectileSystem object. It allocates the projectile arrays,
+        loads the blocked tiles the projectiles stop at and draws the shared projectile surface.
+
+        :param capacity: The maximum number of projectiles alive at the same time.
+        """
+        self.capacity = capacity
+        self.positions = np.zeros((capacity, 2), dtype=np.float32)
+        self.velocities = np.zeros((capacity, 2), dtype=np.float32)
+        self.lifetimes = np.zeros(capacity, dtype=np.int32)
+        self.damage = np.zeros(capacity, dtype=np.float32)
+        self.active = np.zeros(capacity, dtype=bool)
+
+        # projectiles stop at the blocked tiles and at the edge of the map
+        self.blocks = np.array(import_csv('map/map2_FloorBlocks.csv'), dtype=int) != -1
+        self.world_size = np.array(self.blocks.shape[::-1]) * TILESIZE
+
+        # shared surface
+        self.radius = projectile_data['radius']
+        self.image = pygame.Surface((self.radius * 2, self.radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(self.image, PROJECTILE_COLOR, (self.radius, self.radius), self.radius)
+
+    def __len__(self):
+        """
+        This method gets the number of projectiles alive.
+
+        :return: The number of projectiles alive.
+        """
+        return int(np.count_nonzero(self.active))
+
+    def fire(self, pos, direction, damage):
+        """
+        This method fires a projectile. If every slot is taken, the projectile is not fired.
+
+        :param pos: The position the projectile starts at.
+        :param direction: The normalized direction of the projectile.
+        :param damage: The damage the projectile deals.
+        :return: Whether the projectile was fired.
+        """
+        free = np.flatnonzero(~self.active)
+        if not len(free):
+            return False
+
+        slot = free[0]
+        self.positions[slot] = pos
+        self.velocities[slot] = (direction[0] * projectile_data['speed'], direction[1] * projectile_data['speed'])
+        self.lifetimes[slot] = projectile_data['lifetime']
+        self.damage[slot] = damage
+        self.active[slot] = True
+        return True
+
+    def clear(self):
+        """
+        This method removes every projectile.
+        """
+        self.active[:] = False
+
+    def update(self):
+        """
+        This method moves every projectile and removes the ones that expired, left the map or hit a blocked tile.
+        """
+        if not self.active.any():
+            return
+
+        active = self.active
+        self.positions[active] += self.velocities[active]
+        self.lifetimes[active] -= 1
+
+        positions = self.positions[active]
+        inside = ((positions >= 0) & (positions < self.world_size)).all(axis=1)
+        cells = (positions[inside] // TILESIZE).astype(int)
+        alive = inside & (self.lifetimes[active] > 0)
+        alive[inside] &= ~self.blocks[cells[:, 1], cells[:, 0]]
+        self.active[active] = alive
+
+    def collide(self, enemies, queued=()):
+        """
+        This method finds the projectiles touching an enemy's hitbox, every projectile against every enemy at once.
+        Only the hits that count are taken: enemies that are invulnerable or already hit this frame are skipped,
+        so the projectiles touching them fly on, and every enemy takes at most one projectile per frame.
+        A projectile touching several enemies hits the one whose hitbox center is nearest. The projectiles
+        that hit are removed.
+
+        :param enemies: The enemy sprites.
+        :param queued: The enemies already hit this frame.
+        :return: A list of (enemy, damage) pairs.
+        """
+        if not enemies or not self.active.any():
+            return []
+
+        enemies = enemies.sprites()
+        hitboxes = np.array([enemy.hitbox for enemy in enemies], dtype=np.float32).reshape(-1, 4)
+        hittable = np.array([enemy.vulnerable and enemy not in queued for enemy in enemies], dtype=bool)
+        left = hitboxes[:, 0] - self.radius
+        top = hitboxes[:, 1] - self.radius
+        right = left + hitboxes[:, 2] + self.radius * 2
+        bottom = top + hitboxes[:, 3] + self.radius * 2
+
+        slots = np.flatnonzero(self.active)
+        xs = self.positions[slots, 0, np.newaxis]
+        ys = self.positions[slots, 1, np.newaxis]
+        touching = (xs >= left) & (xs < right) & (ys >= top) & (ys < bottom) & hittable
+
+        hit = touching.any(axis=1)
+        if not hit.any():
+            return []
+        centers_x = hitboxes[:, 0] + hitboxes[:, 2] / 2
+        centers_y = hitboxes[:, 1] + hitboxes[:, 3] / 2
+        distances = np.where(touching[hit], (xs[hit] - centers_x) ** 2 + (ys[hit] - centers_y) ** 2, np.inf)
+        targets, first = np.unique(distances.argmin(axis=1), return_index=True)  # the first projectile per enemy
+        slots = slots[hit][first]
+        self.active[slots] = False
+        return [(enemies[target], float(damage)) for target, damage in zip(targets, self.damage[slots])]
+
+    def draw(self, draw_list, offset):
+        """
+        This method queues the projectiles on a draw list. Projectiles outside the screen are skipped.
+
+        :param draw_list: The DrawList to queue the projectiles on.
+        :param offset: The camera offset.
+        """
+        if not self.active.any():
+            return
+
+        positions = self.positions[self.active] - (offset.x + self.radius, offset.y + self.radius)
+        on_screen = ((positions > -self.radius * 2) & (positions < (WIDTH, HEIGHT))).all(axis=1)
+        image = self.image
+        draw_list.extend([(image, pos) for pos in positions[on_screen].astype(int).tolist()])
@@ -0,0 +1,211 @@
+from weakref import WeakKeyDictionary
+import pygame
+from settings import *
+
+try:
+    from pygame._sdl2.video import Window, Renderer, Texture
+    from pygame._sdl2.sdl2 import error as SDLError
+except ImportError:  # pygame built without the SDL2 video module
+    Window = Renderer = Texture = None
+    SDLError = pygame.error
+
+_renderer = None
+
+
+def create_renderer(kind=RENDERER):
+    """
+    This function opens the game window with the requested renderer and makes it the current renderer.
+    The texture renderer tries the GPU first and then SDL's software renderer; if pygame._sdl2 is missing
+    or no renderer can be created, it falls back to the surface renderer.
+
+    :param kind: The renderer to use ('surface' or 'texture').
+    :return: The renderer.
+    """
+    global _renderer
+
+    _renderer = None
+    if kind == 'texture' and Renderer is not None:
+        try:
+            _renderer = TextureRenderer()
+        except (pygame.error, SDLError):
+            _renderer = None
+    if _renderer is None:
+        _renderer = SurfaceRenderer()
+    return _renderer
+
+
+def get_renderer():
+    """
+    This function gets the current renderer, creating a surface renderer if there is none yet.
+
+    :return: The renderer.
+    """
+    if _renderer is None:
+        return create_renderer('surface')
+    return _renderer
+
+
+class SurfaceRenderer:
+    """
+    The SurfaceRenderer class draws with software blits straight on the display surface.
+    The HUD surface is the display surface itself, so drawing the HUD costs nothing extra.
+    """
+
+    name = 'surface'
+    software = True
+
+    def __init__(self):
+        """
+        This method initializes a SurfaceRenderer object. It sets the display mode if needed
+        and uses the display surface as its surface.
+        """
+        self.surface = pygame.display.get_surface()
+        if self.surface is None or self.surface.get_size() != (WIDTH, HEIGHT):
+            self.surface = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption('Survivors')
+
+    def begin_frame(self, fill=True):
+        """
+        This method starts a new frame.
+
+        :param fill: Whether to clear the screen with black.
+        """
+        if fill:
+            self.surface.fill('black')
+
+    def blit(self, image, pos):
+        """
+        This method draws an image on the screen.
+
+        :param image: The image to draw.
+        :param pos: The position of the top left corner of the image.
+        """
+        self.surface.blit(image, pos)
+
+    def blits(self, blit_sequence, doreturn=False):
+        """
+        This method draws several images on the screen with a single blits call.
+
+        :param blit_sequence: The (image, position) pairs to draw, in order.
+        :param doreturn: Whether to return the changed rects, like Surface.blits.
+        :return: The changed rects, or None.
+        """
+        return self.surface.blits(blit_sequence, doreturn=doreturn)
+
+    def snapshot(self):
+        """
+        This method gets a copy of everything drawn in the current frame.
+
+        :return: The copied surface.
+        """
+        return self.surface.copy()
+
+    def present(self):
+        """
+        This method shows the frame on the screen.
+        """
+        pygame.display.update()
+
+
+class TextureRenderer:
+    """
+    The TextureRenderer class draws with textures through pygame._sdl2.video.
+    Every image is uploaded to a texture the first time it is drawn, afterwards drawing it is a texture copy.
+    The HUD is drawn on a transparent surface that is uploaded once per frame and drawn over the world.
+    The display module is only kept as a hidden 1x1 window, so images can still be converted to the display format.
+
+    :param accelerated: Whether to try a GPU renderer before SDL's software renderer.
+    """
+
+    name = 'texture'
+    software = False
+
+    def __init__(self, accelerated=True):
+        """
+        This method initializes a TextureRenderer object. It opens the window, creates the SDL renderer,
+        and sets up the texture cache and the HUD surface.
+
+        :param accelerated: Whether to try a GPU renderer before SDL's software renderer.
+        """
+        if pygame.display.get_surface() is None:
+            pygame.display.set_mode((1, 1), pygame.HIDDEN)
+        self.window = Window('Survivors', size=(WIDTH, HEIGHT))
+        try:
+            self.renderer = Renderer(self.window, accelerated=1 if accelerated else 0)
+            self.accelerated = accelerated
+        except (pygame.error, SDLError):
+            self.renderer = Renderer(self.window, accelerated=0)
+            self.accelerated = False
+
+        self.textures = WeakKeyDictionary()
+        self.surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        self.overlay = Texture(self.renderer, (WIDTH, HEIGHT), streaming=True)
+        self.overlay.blend_mode = pygame.BLENDMODE_BLEND
+
+    def texture(self, image):
+        """
+        This method gets the texture of an image, uploading it the first time.
+
+        :param image: The image.
+        :return: The texture.
+        """
+        texture = self.textures.get(image)
+        if texture is None:
+            texture = Texture.from_surface(self.renderer, image)
+            self.textures[image] = texture
+        return texture
+
+    def begin_frame(self, fill=True):
+        """
+        This method starts a new frame. The screen is always cleared, since the window's contents
+        are not kept between frames.
+
+        :param fill: Unused, kept for the signature of SurfaceRenderer.
+        """
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+        self.surface.fill((0, 0, 0, 0))
+
+    def blit(self, image, pos):
+        """
+        This method draws an image on the screen with a texture copy.
+
+        :param image: The image to draw.
+        :param pos: The position of the top left corner of the image.
+        """
+        self.texture(image).draw(dstrect=(int(pos[0]), int(pos[1])))
+
+    def blits(self, blit_sequence, doreturn=False):
+        """
+        This method draws several images on the screen with texture copies, in order.
+
+        :param blit_sequence: The (image, integer position) pairs to draw.
+        :param doreturn: Unused, kept for the signature of Surface.blits.
+        """
+        texture = self.texture
+        for image, pos in blit_sequence:
+            texture(image).draw(dstrect=pos)
+
+    def draw_hud(self):
+        """
+        This method uploads the HUD surface and draws it over the world.
+        """
+        self.overlay.update(self.surface)
+        self.overlay.draw()
+        self.surface.fill((0, 0, 0, 0))
+
+    def snapshot(self):
+        """
+        This method gets a copy of everything drawn in the current frame, HUD included.
+
+        :return: The copied surface.
+        """
+        self.draw_hud()
+        return self.renderer.to_surface()
+
+    def present(self):
+        """
+        This method draws the HUD and shows the frame on the screen.
+        """
+        self.draw_hud()
+        self.renderer.present()
@@ -0,0 +1,78 @@
+from collections import deque
+from weakref import WeakKeyDictionary
+import pygame
+from settings import *
+
+
+class ResolutionScaler:
+    """
+    The ResolutionScaler class picks the scale the world is rendered at. It keeps a rolling window of frame times,
+    steps the scale down when the average frame time is over budget and steps it back up when there is headroom.
+    It also caches the scaled copies of the surfaces drawn at reduced scale, so every surface is scaled only once.
+
+    :param scales: The render scales from the best to the cheapest, starting with 1.
+    :param budget: The frame time budget in milliseconds.
+    :param window: The number of frames averaged before the scale changes.
+    """
+
+    def __init__(self, scales=RENDER_SCALES, budget=FRAME_BUDGET_MS, window=FRAME_TIME_WINDOW):
+        """
+        This method initializes a ResolutionScaler object. It sets up the scales, the frame time window,
+        and a cache of scaled surfaces for every scale.
+
+        :param scales: The render scales from the best to the cheapest, starting with 1.
+        :param budget: The frame time budget in milliseconds.
+        :param window: The number of frames averaged before the scale changes.
+        """
+        self.scales = scales
+        self.scale_index = 0
+        self.budget = budget
+        self.frame_times = deque(maxlen=window)
+        self.cache = [WeakKeyDictionary() for _ in scales]
+
+    @property
+    def scale(self):
+        """
+        This property gets the current render scale.
+
+        :return: The scale, 1 means the native resolution.
+        """
+        return self.scales[self.scale_index]
+
+    def record(self, frame_time):
+        """
+        This method records the time of a frame. Once the window is full, it changes the scale
+        if the average frame time is over budget or well under it.
+
+        :param frame_time: The time the frame took in milliseconds.
+        """
+        self.frame_times.append(frame_time)
+        if len(self.frame_times) < self.frame_times.maxlen:
+            return
+
+        average = sum(self.frame_times) / len(self.frame_times)
+        if average > self.budget and self.scale_index < len(self.scales) - 1:
+            self.scale_index += 1
+            self.frame_times.clear()
+        elif average < self.budget * RECOVERY_RATIO and self.scale_index > 0:
+            self.scale_index -= 1
+            self.frame_times.clear()
+
+    def scaled(self, surface):
+        """
+        This method gets a surface at the current scale, scaling it the first time it is requested.
+
+        :param surface: The surface at native resolution.
+        :return: The surface at the current scale.
+        """
+        if self.scale_index == 0:
+            return surface
+
+        cache = self.cache[self.scale_index]
+        scaled_surface = cache.get(surface)
+        if scaled_surface is None:
+            width, height = surface.get_size()
+            size = (max(1, round(width * self.scale)), max(1, round(height * self.scale)))
+            scaled_surface = pygame.transform.scale(surface, size)
+            cache[surface] = scaled_surface
+        return scaled_surface
@@ -0,0 +1,537 @@
+import os
+import pygame
+from settings import *
+from level import Level
+from Button import Button
+from assets import preloader
+from renderer import get_renderer
+import snapshot
+from profiler import SamplingProfiler
+
+
+class SceneManager:
+    """
+    The SceneManager class runs the game's single main loop and switches between the scenes.
+    Active scenes run every frame at FPS. Idle scenes, the ones only changing on input, block on the event queue
+    and are only redrawn when an event arrives, so menus and end screens barely use the CPU.
+    The menu and the explanation scenes are created once and reused when the game is restarted.
+    F8 starts or stops a sampling profile of the main loop, and the path of the written profile is shown
+    as a notice over the scenes for a few seconds.
+
+    :param profile: The number of seconds to profile once the game starts, or None.
+    """
+
+    def __init__(self, profile=None):
+        """
+        This method initializes a SceneManager object. It gets the renderer, initializes the clock and the profiler,
+        and creates the menu and explanation scenes, starting with the menu.
+
+        :param profile: The number of seconds to profile once the game starts, or None.
+        """
+        self.renderer = get_renderer()
+        self.clock = pygame.time.Clock()
+        self.profiler = SamplingProfiler()
+        self.pending_profile = profile
+        self.menu = MenuScene(self)
+        self.explanation = ExplanationScene(self)
+        self.scene = None
+        self.redraw = True
+        self.notice_font = pygame.font.Font(UI_FONT, NOTICE_FONT_SIZE)
+        self.notice = None
+        self.notice_end = 0
+        self.switch(self.menu)
+
+    def switch(self, scene):
+        """
+        This method switches to another scene, which is drawn on the next frame.
+
+        :param scene: The scene to switch to, or None to quit.
+        """
+        self.scene = scene
+        self.redraw = True
+        if scene is not None:
+            scene.enter()
+
+    def quit(self):
+        """
+        This method stops the main loop.
+        """
+        self.switch(None)
+
+    def toggle_profile(self, duration=PROFILE_DURATION):
+        """
+        This method starts a profile of the main loop, or ends the running one early.
+
+        :param duration: The number of seconds to profile.
+        """
+        if self.profiler.running:
+            self.finish_profile()
+        else:
+            self.profiler.start(duration)
+
+    def start_pending_profile(self):
+        """
+        This method starts the profile requested on the command line, the first time the game starts.
+        """
+        if self.pending_profile is not None:
+            self.profiler.start(self.pending_profile)
+            self.pending_profile = None
+
+    def finish_profile(self):
+        """
+        This method writes the profile, tagged with the state of the current scene.
+        """
+        tags = self.scene.profile_tags() if self.scene is not None else {}
+        paths = self.profiler.write(tags)
+        if paths:
+            self.show_notice(f"Profile written to {', '.join(paths)}")
+
+    def show_notice(self, text):
+        """
+        This method shows a line of text over the scenes for NOTICE_DURATION ms.
+
+        :param text: The text to show.
+        """
+        self.notice = self.notice_font.render(text, True, UI_TEXT_COLOR)
+        self.notice_end = pygame.time.get_ticks() + NOTICE_DURATION
+        self.redraw = True
+
+    def draw_notice(self):
+        """
+        This method draws the notice, if any, in a box at the top of the screen.
+        Once it is over, the notice is dropped.
+        """
+        if self.notice is None:
+            return
+        if pygame.time.get_ticks() >= self.notice_end:
+            self.notice = None
+            return
+        surface = self.renderer.surface
+        notice_rect = self.notice.get_rect(midtop=(WIDTH // 2, 20))
+        pygame.draw.rect(surface, UI_BG_COLOR, notice_rect.inflate(20, 10))
+        pygame.draw.rect(surface, UI_BORDER_COLOR, notice_rect.inflate(20, 10), 3)
+        surface.blit(self.notice, notice_rect)
+
+    def get_events(self, idle):
+        """
+        This method gets the events of the current frame. Idle scenes wait for the next event,
+        or at most IDLE_TIMEOUT ms, instead of returning right away.
+
+        :param idle: Whether the current scene is idle.
+        :return: The list of events.
+        """
+        if not idle:
+            return pygame.event.get()
+        event = pygame.event.wait(IDLE_TIMEOUT)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    def run(self):
+        """
+        This method runs the main loop until the window is closed or a scene quits.
+        Every frame, it passes the events to the current scene and runs it.
+        An idle scene is only run when an event arrived, after a switch, or when it is woken up by the timeout
+        and asks for it with its wants_update method.
+        """
+        while self.scene is not None:
+            scene = self.scene
+            idle = scene.idle
+            events = self.get_events(idle)
+            for event in events:
+                if event.type in (pygame.QUIT, pygame.WINDOWCLOSE):  # If the user closes the window, exit the game
+                    self.quit()
+                    break
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_F8:  # Start or stop profiling
+                    self.toggle_profile()
+                    continue
+                scene.handle_event(event)
+                if self.scene is not scene:
+                    break
+            if self.scene is not scene:
+                continue
+
+            if not idle or events or self.redraw or scene.wants_update():
+                self.redraw = False
+                self.renderer.begin_frame(fill=scene.fill)
+                scene.run()
+                self.draw_notice()
+                self.renderer.present()
+            elif self.notice is not None and pygame.time.get_ticks() >= self.notice_end:
+                self.redraw = True  # an idle scene is redrawn without the notice on its next frame
+            if not idle:
+                self.clock.tick(FPS)
+                scene.record_frame_time(self.clock.get_rawtime())
+                self.profiler.record_frame(self.clock.get_rawtime())
+            if self.profiler.finished:
+                self.finish_profile()
+        if self.profiler.running or self.profiler.finished:
+            self.finish_profile()
+        pygame.quit()
+
+
+class Scene:
+    """
+    The Scene class is the base class of the scenes. A scene handles its events and draws one frame at a time.
+
+    :param manager: The scene manager.
+    """
+
+    fill = True
+
+    def __init__(self, manager):
+        """
+        This method initializes a Scene object.
+
+        :param manager: The scene manager.
+        """
+        self.manager = manager
+        self.display_surface = get_renderer().surface
+
+    @property
+    def idle(self):
+        """
+        This property tells if the scene only changes on input, so the main loop can wait for events.
+
+        :return: True if the scene is idle, False otherwise.
+        """
+        return True
+
+    def enter(self):
+        """
+        This method is called when the scene becomes the current scene.
+        """
+
+    def handle_event(self, event):
+        """
+        This method handles an event.
+
+        :param event: The event to handle.
+        """
+
+    def wants_update(self):
+        """
+        This method tells if an idle scene has to be run although no event arrived.
+
+        :return: True if the scene has to be run, False otherwise.
+        """
+        return False
+
+    def run(self):
+        """
+        This method draws one frame of the scene.
+        """
+
+    def record_frame_time(self, frame_time):
+        """
+        This method records how long the last frame of an active scene took.
+
+        :param frame_time: The time the frame took in milliseconds.
+        """
+
+    def profile_tags(self):
+        """
+        This method describes the scene in the file names of the profiles.
+
+        :return: A dictionary of tags.
+        """
+        return {'scene': type(self).__name__}
+
+
+class MenuScene(Scene):
+    """
+    The MenuScene class represents the main menu. It shows the title, the loading progress of the assets,
+    and the start and exit buttons. It stays active while the assets are loading, then becomes idle.
+
+    :param manager: The scene manager.
+    """
+
+    def __init__(self, manager):
+        """
+        This method initializes a MenuScene object. It loads the menu images and fonts and creates the buttons.
+
+        :param manager: The scene manager.
+        """
+        super().__init__(manager)
+        start_img = pygame.image.load("start_img.png").convert_alpha()
+        exit_img = pygame.image.load("exit_img.png").convert_alpha()
+        self.background = pygame.transform.rotozoom(pygame.image.load("SurvivorsBG.png "), 0, 0.5)
+        title_font = pygame.font.Font(UI_FONT, 100)  # Set the font for the title
+        self.title = title_font.render("SURVIVORS", 1, "white")  # Render the title
+        self.loading_font = pygame.font.Font(UI_FONT, UI_FONT_SIZE)  # Set the font for the loading progress
+        self.start_button = Button(WIDTH // 2, HEIGHT * (3 / 5), start_img, 0.8)  # Create the start button
+        self.exit_button = Button(WIDTH // 2, HEIGHT * (4 / 5), exit_img, 0.8)  # Create the exit button
+
+    @property
+    def idle(self):
+        """
+        This property tells if the menu is idle, which is the case once every asset is loaded.
+
+        :return: True if the menu is idle, False otherwise.
+        """
+        return preloader.done
+
+    def handle_event(self, event):
+        """
+        This method handles the clicks on the start and exit buttons.
+
+        :param event: The event to handle.
+        """
+        if self.start_button.is_clicked(event):  # Show the explanation before the game
+            self.manager.switch(self.manager.explanation)
+        elif self.exit_button.is_clicked(event):  # Exit the game
+            self.manager.quit()
+
+    def run(self):
+        """
+        This method draws the menu and converts the assets decoded since the last frame.
+        """
+        progress = preloader.poll()
+        screen = self.display_surface
+        screen.blit(self.background, (0, 0))  # Draw the background
+        title = self.title
+        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, HEIGHT // 2 - title.get_width() // 2))
+        if not preloader.done:  # Show the loading progress until every asset is ready
+            loading = self.loading_font.render(f"Loading {int(progress * 100)}%", 1, "white")
+            screen.blit(loading, (WIDTH // 2 - loading.get_width() // 2, HEIGHT - loading.get_height() - 10))
+        self.start_button.draw()
+        self.exit_button.draw()
+
+
+class ExplanationScene(Scene):
+    """
+    The ExplanationScene class shows how to play and starts a new game when the Enter key is pressed.
+    It keeps converting the assets while they are loading.
+
+    :param manager: The scene manager.
+    """
+
+    def __init__(self, manager):
+        """
+        This method initializes an ExplanationScene object. It loads the explanation image.
+
+        :param manager: The scene manager.
+        """
+        super().__init__(manager)
+        self.explanation = pygame.image.load("explanation.png").convert()
+
+    @property
+    def idle(self):
+        """
+        This property tells if the explanation is idle, which is the case once every asset is loaded.
+
+        :return: True if the explanation is idle, False otherwise.
+        """
+        return preloader.done
+
+    def handle_event(self, event):
+        """
+        This method starts a new game when the Enter key is pressed.
+        The level picks up the assets cached by the preloader, so restarting does not load them again.
+
+        :param event: The event to handle.
+        """
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+            self.manager.switch(PlayingScene(self.manager, Level()))
+
+    def run(self):
+        """
+        This method draws the explanation and converts the assets decoded since the last frame.
+        """
+        preloader.poll()
+        self.display_surface.blit(self.explanation, (0, 0))
+
+
+class PlayingScene(Scene):
+    """
+    The PlayingScene class runs the level. Escape pauses the game, F5 saves a snapshot of the level
+    and F9 restores it. It switches to the upgrade scene when an upgrade is due
+    and to the end screen when the game is over. It is idle while the game is paused.
+
+    :param manager: The scene manager.
+    :param level: The level to run.
+    """
+
+    def __init__(self, manager, level):
+        """
+        This method initializes a PlayingScene object.
+
+        :param manager: The scene manager.
+        :param level: The level to run.
+        """
+        super().__init__(manager)
+        self.level = level
+
+    def enter(self):
+        """
+        This method starts the profile requested on the command line, if any.
+        """
+        self.manager.start_pending_profile()
+
+    @property
+    def idle(self):
+        """
+        This property tells if the scene is idle, which is the case while the game is paused.
+
+        :return: True if the game is paused, False otherwise.
+        """
+        return self.level.game_paused
+
+    @property
+    def fill(self):
+        """
+        This property tells if the screen is cleared, which is not needed when a frozen level covers it
+        with its backdrop.
+
+        :return: True if the screen is cleared, False otherwise.
+        """
+        return not self.level.frozen
+
+    def handle_event(self, event):
+        """
+        This method handles the pause and quick save keys.
+
+        :param event: The event to handle.
+        """
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:  # Pause or resume
+            self.level.toggle_pause()
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F5:  # Quick save
+            snapshot.save(self.level)
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and os.path.exists(QUICKSAVE_PATH):
+            snapshot.load(self.level)  # Quick load
+
+    def run(self):
+        """
+        This method runs one frame of the level, then switches to the upgrade scene or the end screen if needed.
+        """
+        self.level.run()
+        if self.level.outcome is not None:
+            self.manager.switch(EndScene(self.manager, self.level.outcome))
+        elif not self.level.player.upgrade_performed and not self.level.game_paused:
+            self.manager.switch(UpgradeScene(self.manager, self))
+
+    def record_frame_time(self, frame_time):
+        """
+        This method records how long the last frame took, letting the level adapt its resolution.
+
+        :param frame_time: The time the frame took in milliseconds.
+        """
+        self.level.record_frame_time(frame_time)
+
+    def profile_tags(self):
+        """
+        This method describes the game in the file names of the profiles.
+
+        :return: A dictionary with the scene, the wave and the enemy count.
+        """
+        return {**super().profile_tags(), 'wave': self.level.waves.level, 'enemies': len(self.level.enemy_sprites)}
+
+
+class UpgradeScene(Scene):
+    """
+    The UpgradeScene class shows the upgrade menu over the frozen level, before the first wave
+    and after every cleared wave. It is idle and returns to the game once an upgrade is chosen.
+
+    :param manager: The scene manager.
+    :param playing: The playing scene to return to.
+    """
+
+    fill = False
+
+    def __init__(self, manager, playing):
+        """
+        This method initializes an UpgradeScene object.
+
+        :param manager: The scene manager.
+        :param playing: The playing scene to return to.
+        """
+        super().__init__(manager)
+        self.playing = playing
+        self.level = playing.level
+
+    def enter(self):
+        """
+        This method records the memory at the boundary of the wave that just ended, if any. The game is frozen,
+        so the full collection of the deferred policy does not pause the play.
+        """
+        self.level.memory.wave_boundary()
+
+    def handle_event(self, event):
+        """
+        This method passes the key presses to the upgrade menu and returns to the game once an upgrade is chosen.
+
+        :param event: The event to handle.
+        """
+        self.level.upgrade.handle_event(event)
+        if self.level.player.upgrade_performed:
+            self.manager.switch(self.playing)
+
+    def run(self):
+        """
+        This method draws the upgrade menu over the dimmed backdrop of the level.
+        """
+        self.level.run()
+
+
+class EndScene(Scene):
+    """
+    The EndScene class shows the game over or the win screen for END_SCREEN_DURATION ms,
+    then goes back to the main menu. Any key skips the wait.
+
+    :param manager: The scene manager.
+    :param outcome: The outcome of the game ('game_over' or 'win').
+    """
+
+    def __init__(self, manager, outcome):
+        """
+        This method initializes an EndScene object. It renders the text of the outcome.
+
+        :param manager: The scene manager.
+        :param outcome: The outcome of the game ('game_over' or 'win').
+        """
+        super().__init__(manager)
+        data = end_screen_data[outcome]
+        font = pygame.font.Font(data['font'], 100)
+        self.text = font.render(data['text'], True, data['color'])
+        self.text_rect = self.text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+        self.start_time = None
+
+    def enter(self):
+        """
+        This method starts the timer of the end screen.
+        """
+        self.start_time = pygame.time.get_ticks()
+
+    def timed_out(self):
+        """
+        This method checks if the end screen was shown long enough.
+
+        :return: True if END_SCREEN_DURATION ms passed since the end screen was entered, False otherwise.
+        """
+        return pygame.time.get_ticks() - self.start_time >= END_SCREEN_DURATION
+
+    def wants_update(self):
+        """
+        This method asks for a run once the end screen was shown long enough, so it goes back to the main menu.
+
+        :return: True if the end screen timed out, False otherwise.
+        """
+        return self.timed_out()
+
+    def handle_event(self, event):
+        """
+        This method goes back to the main menu when a key is pressed.
+
+        :param event: The event to handle.
+        """
+        if event.type == pygame.KEYDOWN:
+            self.manager.switch(self.manager.menu)
+
+    def run(self):
+        """
+        This method draws the text of the outcome on a black screen, and goes back to the main menu
+        once the end screen was shown long enough.
+        """
+        self.display_surface.blit(self.text, self.text_rect)
+        if self.timed_out():
+            self.manager.switch(self.manager.menu)
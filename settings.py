@@ -3,14 +3,51 @@ WIDTH = 1280
 HEIGHT = 720
 FPS = 60
 TILESIZE = 64
-LEVEL = 0
-WAVE_SIZE = 0
-enemies = []
 
 BAR_HEIGHT = 20
 BAR_WIDTH = 200
 UI_FONT = 'graphics/Font/Baron Neue.otf'
 UI_FONT_SIZE = 30
+QUICKSAVE_PATH = 'quicksave.bin'
+RENDERER = 'surface'  # 'surface' for software blits, 'texture' for pygame._sdl2 textures
+PROFILE_DIR = 'profiles'
+PROFILE_DURATION = 10  # seconds captured by F8 or --profile
+PROFILE_INTERVAL = 0.002
+PROFILE_SWITCH_INTERVAL = 0.0001
+NOTICE_DURATION = 4000  # ms a notice, such as the path of a written profile, stays on screen
+NOTICE_FONT_SIZE = 18
+
+# memory instrumentation, GC_POLICY is 'default' or 'deferred' (startup objects frozen, full collections
+# moved to the wave boundaries)
+MEMORY_RECORD = False
+MEMORY_TRACE = False
+MEMORY_TRACE_FRAMES = 1
+MEMORY_TOP_STATS = 10
+MEMORY_LOG = 'profiles/memory.log'
+MEMORY_TRACKED_TYPES = ('Enemy', 'Weapon', 'Tile', 'Player')
+GC_POLICY = 'default'
+GC_DEFERRED_THRESHOLD = 1000000
+GC_PAUSE_HISTORY = 1000
+
+# scenes, idle scenes wake up at least every IDLE_TIMEOUT ms
+IDLE_TIMEOUT = 250
+END_SCREEN_DURATION = 5000
+end_screen_data = {
+    'game_over': {'text': 'Game Over', 'font': None, 'color': (255, 0, 0)},
+    'win': {'text': 'You WON!!!', 'font': UI_FONT, 'color': (0, 255, 0)}}
+
+# adaptive resolution
+ADAPTIVE_RESOLUTION = True
+RENDER_SCALES = (1, 0.75, 0.5)
+FRAME_BUDGET_MS = 1000 / FPS
+FRAME_TIME_WINDOW = 30
+RECOVERY_RATIO = 0.5
+
+# minimap
+MINIMAP_SIZE = 180
+MINIMAP_ENEMY_COLOR = (255, 60, 60)
+MINIMAP_PLAYER_COLOR = 'white'
+MINIMAP_ENEMY_INTERVAL = 8  # frames between two plots of the enemies, the plotted frame is reused in between
 
 # colors
 UI_BG_COLOR = (54, 51, 51)
@@ -24,14 +61,92 @@ TEXT_COLOR_SELECTED = '#111111'
 BAR_COLOR = '#EEEEEE'
 BAR_COLOR_SELECTED = '#111111'
 UPGRADE_BG_COLOR_SELECTED = '#EEEEEE'
+BACKDROP_DIM = (110, 110, 110)
 
 
+# audio
+MUSIC = 'sounds/background_music.wav'
+MUSIC_VOLUME = 0.1
+RESERVED_CHANNELS = 2
+sound_data = {
+    'haps': {'path': 'sounds/haps.mp3', 'volume': 0.4, 'voices': 1, 'reserved': True},
+    'victory': {'path': 'sounds/victory.mp3', 'volume': 0.4, 'voices': 1, 'reserved': True},
+    'game_over': {'path': 'sounds/gameOver.wav', 'volume': 0.4, 'voices': 1, 'reserved': True},
+    'player_hit': {'path': 'sounds/player_hit.wav', 'volume': 0.3, 'voices': 1, 'reserved': True},
+    'attack': {'path': 'sounds/tornadoSound.mp3', 'volume': 0.4, 'voices': 2, 'reserved': False},
+    'hit': {'path': 'sounds/hit.wav', 'volume': 0.05, 'voices': 3, 'reserved': False},
+    'death': {'path': 'sounds/death.wav', 'volume': 0.05, 'voices': 3, 'reserved': False}}
+
 # weapons
 weapon_data = {
     'tornado': {'cooldown': 20, 'damage': 20}}
 
+# projectiles, fired with the left mouse button
+PROJECTILE_CAPACITY = 512
+PROJECTILE_COLOR = (255, 230, 120)
+projectile_data = {'cooldown': 250, 'damage': 5, 'speed': 12, 'lifetime': 60, 'radius': 5}
+
+# effects
+PARTICLE_CAPACITY = 1024
+PARTICLE_LIFETIME = 24
+PARTICLE_DRAG = 0.9
+PARTICLE_GRAVITY = 0.15
+DAMAGE_NUMBER_CAPACITY = 128
+DAMAGE_NUMBER_LIFETIME = 40
+DAMAGE_NUMBER_RISE = 1
+DAMAGE_NUMBER_DIGITS = 4
+DAMAGE_NUMBER_FONT_SIZE = 20
+DAMAGE_NUMBER_COLOR = (255, 240, 200)
+effect_data = {
+    'hit': {'color': (255, 170, 40), 'size': 3, 'count': 6, 'speed': 3},
+    'death': {'color': (200, 40, 40), 'size': 4, 'count': 16, 'speed': 5}}
+
+# simulation environments
+ENV_MAX_ENEMIES = 32
+ENV_FRAME_SKIP = 4
+ENV_SEED_STRIDE = 1000  # seed distance between the environments of a VectorEnv
+
+# waves
+WAVE_GROWTH = 5
+WIN_LEVEL = 10
+ENDLESS_MODE = False
+POPULATION_CAP = 200
+STREAM_SPAWN_RATE = 2
+
+# world streaming, chunks of CHUNK_SIZE x CHUNK_SIZE tiles are built around the view
+CHUNK_SIZE = 16
+CHUNK_BUDGET = 9
+CHUNK_MARGIN = TILESIZE * 2
+CHUNK_PREFETCH_DISTANCE = 512  # how far ahead of the view the chunks are prefetched, in pixels
+CHUNK_PREFETCH_LOADS = 1  # chunks prefetched per frame
+ENEMY_SPAWN_AREA = (1100, 600, 1400, 2300)
+SPAWN_ATTEMPTS = 10  # positions tried for an enemy before it is left overlapping an obstacle
+
+# floor, drawn from the floor layers with a tileset cropped from FLOOR_SOURCE and cached,
+# pre-rendered in chunks of FLOOR_CHUNK_SIZE x FLOOR_CHUNK_SIZE tiles
+FLOOR_SOURCE = 'graphics/map2.png'
+FLOOR_LAYERS = ('map/map2_Floor.csv', 'map/map2_Grass.csv')
+FLOOR_TILESET = 'graphics/cache/floor_tileset.png'
+FLOOR_TILESET_INDEX = 'graphics/cache/floor_tileset.csv'
+FLOOR_CHUNK_SIZE = 8
+FLOOR_CACHE_SIZE = 20
+
+# timer wheel, ticks of 1 ms, the wheels cover 256 ms, 65 s and 4.6 h
+TIMER_WHEEL_SLOTS = 256
+TIMER_WHEEL_LEVELS = 3
+
+# enemy AI level of detail
+AI_NEAR_RADIUS = 800
+AI_VIEW_MARGIN = 100
+AI_FAR_BUDGET = 50
+
+# enemy AI worker process, for massive waves, off by default, the timeout is in seconds
+# its enemies collide with the chunks resident at the end of the previous frame and all think every frame
+AI_WORKER = False
+AI_WORKER_CAPACITY = 4096
+AI_WORKER_TIMEOUT = 1
+
 # enemy
-enemies = []
 enemy_data = {
     'tomato': {'health': 100, 'damage': 12, 'speed': 3, 'resistance': 5, 'attack_radius': 50},
     'slug': {'health': 200, 'damage': 5, 'speed': 2, 'resistance': 5, 'attack_radius': 40},
@@ -0,0 +1,160 @@
+import struct
+import sys
+from array import array
+from settings import *
+
+MAGIC = b'SRVS'
+VERSION = 1
+HEADER_FORMAT = '<4sH'
+WAVES_FORMAT = '<iii'  # level, wave size, kills
+PLAYER_FORMAT = '<iifffff?'  # hitbox center, health, health/attack/speed stats, speed, upgrade performed
+COUNT_FORMAT = '<I'
+ENEMY_NAMES = list(enemy_data.keys())
+
+
+def pack_array(typecode, values):
+    """
+    This function packs a sequence of numbers into little-endian bytes.
+
+    :param typecode: The array typecode of the numbers.
+    :param values: The numbers to pack.
+    :return: The packed bytes.
+    """
+    data = array(typecode, values)
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data.tobytes()
+
+
+def unpack_array(typecode, blob, offset, count):
+    """
+    This function unpacks little-endian numbers packed by pack_array.
+
+    :param typecode: The array typecode of the numbers.
+    :param blob: The bytes to read from.
+    :param offset: The position of the first number in the bytes.
+    :param count: The number of numbers to read.
+    :return: The array of numbers and the position right after them.
+    """
+    data = array(typecode)
+    end = offset + count * data.itemsize
+    data.frombytes(blob[offset:end])
+    if sys.byteorder == 'big':
+        data.byteswap()
+    return data, end
+
+
+def capture(level):
+    """
+    This function captures the state of a level into a compact binary snapshot.
+    The enemies and the remaining food of the whole map are stored as flat arrays of numbers, not as pickled sprites.
+    Timers are not stored, every enemy and the player come back vulnerable and ready to attack.
+
+    :param level: The level to capture.
+    :return: The snapshot bytes.
+    """
+    player = level.player
+    waves = level.waves
+    parts = [struct.pack(HEADER_FORMAT, MAGIC, VERSION),
+             struct.pack(WAVES_FORMAT, waves.level, waves.wave_size, waves.kills),
+             struct.pack(PLAYER_FORMAT, *player.hitbox.center, player.health, *player.stats.values(),
+                         player.speed, player.upgrade_performed)]
+
+    enemies = level.enemy_sprites.sprites()
+    parts.append(struct.pack(COUNT_FORMAT, len(enemies)))
+    parts.append(pack_array('B', [ENEMY_NAMES.index(enemy.enemy_name) for enemy in enemies]))
+    parts.append(pack_array('B', [enemy.animation_phase for enemy in enemies]))
+    parts.append(pack_array('i', [coordinate for enemy in enemies for coordinate in enemy.hitbox.center]))
+    parts.append(pack_array('f', [enemy.health for enemy in enemies]))
+
+    food = level.world.food_items()
+    parts.append(struct.pack(COUNT_FORMAT, len(food)))
+    parts.append(pack_array('B', [image_index for image_index, _ in food]))
+    parts.append(pack_array('i', [coordinate for _, pos in food for coordinate in pos]))
+    return b''.join(parts)
+
+
+def restore(level, blob):
+    """
+    This function restores the state of a level from a snapshot made by capture.
+    The enemies and the food of the level are replaced by the ones in the snapshot.
+
+    :param level: The level to restore.
+    :param blob: The snapshot bytes.
+    """
+    magic, version = struct.unpack_from(HEADER_FORMAT, blob)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not a Survivors snapshot or an unsupported version')
+    offset = struct.calcsize(HEADER_FORMAT)
+
+    wave_state = struct.unpack_from(WAVES_FORMAT, blob, offset)
+    offset += struct.calcsize(WAVES_FORMAT)
+    x, y, health, *stats, speed, upgrade_performed = struct.unpack_from(PLAYER_FORMAT, blob, offset)
+    offset += struct.calcsize(PLAYER_FORMAT)
+
+    # player
+    player = level.player
+    level.destroy_weapon()
+    level.projectiles.clear()
+    if level.effects:
+        level.effects.clear()
+    player.hitbox.center = (x, y)
+    player.rect.center = player.hitbox.center
+    player.health = health
+    player.stats = dict(zip(player.stats.keys(), stats))
+    player.speed = speed
+    player.upgrade_performed = upgrade_performed
+    player.vulnerable = True
+
+    # enemies, replaced without telling the wave listeners, the wave was not cleared by the player
+    waves = level.waves
+    listeners, waves.listeners = waves.listeners, []
+    for enemy in level.enemy_sprites.sprites():
+        enemy.kill()
+    waves.listeners = listeners
+
+    count, = struct.unpack_from(COUNT_FORMAT, blob, offset)
+    offset += struct.calcsize(COUNT_FORMAT)
+    types, offset = unpack_array('B', blob, offset, count)
+    phases, offset = unpack_array('B', blob, offset, count)
+    positions, offset = unpack_array('i', blob, offset, count * 2)
+    healths, offset = unpack_array('f', blob, offset, count)
+    for index in range(count):
+        enemy = level.spawn_enemy(ENEMY_NAMES[types[index]], (0, 0))
+        enemy.hitbox.center = (positions[index * 2], positions[index * 2 + 1])
+        enemy.rect.center = enemy.hitbox.center
+        enemy.animation_phase = phases[index]
+        enemy.health = healths[index]
+    waves.level, waves.wave_size, waves.kills = wave_state
+
+    # food of the whole map, the resident chunks rebuild their food tiles
+    count, = struct.unpack_from(COUNT_FORMAT, blob, offset)
+    offset += struct.calcsize(COUNT_FORMAT)
+    images, offset = unpack_array('B', blob, offset, count)
+    positions, offset = unpack_array('i', blob, offset, count * 2)
+    level.world.set_food([(images[index], (positions[index * 2], positions[index * 2 + 1])) for index in range(count)])
+
+    # the frozen backdrop shows the old state
+    level.backdrop = None
+
+
+def save(level, path=QUICKSAVE_PATH):
+    """
+    This function writes a snapshot of a level to a file.
+
+    :param level: The level to save.
+    :param path: The path to the file.
+    """
+    with open(path, 'wb') as file:
+        file.write(capture(level))
+
+
+def load(level, path=QUICKSAVE_PATH):
+    """
+    This function restores a level from a snapshot file.
+
+    :param level: The level to restore.
+    :param path: The path to the file.
+    """
+    with open(path, 'rb') as file:
+        restore(level, file.read())
@@ -1,6 +1,7 @@
 from csv import reader
 from os import walk
 import pygame
+from assets import preloader
 
 
 def import_csv(path):
@@ -30,6 +31,6 @@ def import_folder(path):
     for _, __, img_files in walk(path):
         for image in img_files:
             full_path = path + '/' + image
-            image_surface = pygame.image.load(full_path).convert_alpha()
+            image_surface = preloader.image(full_path)
             surface_list.append(image_surface)
     return surface_list
@@ -0,0 +1,114 @@
+import pygame
+from settings import *
+
+
+class TimerWheel:
+    """
+    The TimerWheel class is a hierarchical timer wheel that calls functions once their delay has passed.
+    Time moves in ticks of one millisecond. The first wheel has one slot per tick, every slot of the next wheel
+    covers a whole turn of the previous one, and timers further away than the last wheel wait in an overflow list.
+    When a wheel completes a turn, the timers of the next wheel's current slot cascade down into it, so a timer
+    is only handled when it is scheduled, when it cascades and when it expires.
+    Entities register their expirations here instead of comparing timestamps every frame.
+
+    :param get_ticks: The function giving the current time in milliseconds.
+    :param slots: The number of slots of every wheel.
+    :param levels: The number of wheels.
+    """
+
+    def __init__(self, get_ticks=pygame.time.get_ticks, slots=TIMER_WHEEL_SLOTS, levels=TIMER_WHEEL_LEVELS):
+        """
+        This method initializes a TimerWheel object with empty wheels, at the current time.
+
+        :param get_ticks: The function giving the current time in milliseconds.
+        :param slots: The number of slots of every wheel.
+        :param levels: The number of wheels.
+        """
+        self.get_ticks = get_ticks
+        self.slots = slots
+        self.levels = levels
+        self.spans = [slots ** level for level in range(levels + 1)]  # the ticks covered by a slot of every wheel
+        self.wheels = [[[] for _ in range(slots)] for _ in range(levels)]
+        self.overflow = []
+        self.current = get_ticks()  # the last tick handled
+        self.pending = 0
+
+    def __len__(self):
+        """
+        This method gets the number of timers waiting.
+
+        :return: The number of timers waiting.
+        """
+        return self.pending
+
+    def schedule(self, delay, callback):
+        """
+        This method calls a function once a delay has passed. It is called by the first update
+        at or after the expiration time.
+
+        :param delay: The delay in milliseconds.
+        :param callback: The function to call, without arguments.
+        """
+        due = max(self.current + 1, self.get_ticks() + int(delay))
+        self.insert(due, callback)
+        self.pending += 1
+
+    def insert(self, due, callback):
+        """
+        This method puts a timer in the slot of the lowest wheel whose turn still reaches its expiration time.
+
+        :param due: The tick the timer expires at.
+        :param callback: The function to call.
+        """
+        delay = due - self.current
+        for level in range(self.levels):
+            if delay < self.spans[level + 1]:
+                self.wheels[level][due // self.spans[level] % self.slots].append((due, callback))
+                return
+        self.overflow.append((due, callback))
+
+    def cascade(self, level):
+        """
+        This method moves the timers of a wheel's current slot down to the lower wheels.
+
+        :param level: The wheel, or the number of wheels for the overflow list.
+        """
+        if level == self.levels:
+            timers, self.overflow = self.overflow, []
+        else:
+            index = self.current // self.spans[level] % self.slots
+            timers = self.wheels[level][index]
+            self.wheels[level][index] = []
+        for due, callback in timers:
+            self.insert(due, callback)
+
+    def update(self):
+        """
+        This method advances the wheels to the current time and calls every expired timer, in order.
+        Without any timer waiting, it jumps straight to the current time.
+        """
+        now = self.get_ticks()
+        if not self.pending:
+            self.current = max(self.current, now)
+            return
+
+        first = self.wheels[0]
+        while self.current < now and self.pending:
+            self.current += 1
+            tick = self.current
+
+            # a completed turn cascades the higher wheels, from the highest one down
+            if tick % self.slots == 0:
+                level = 1
+                while level < self.levels and tick % self.spans[level + 1] == 0:
+                    level += 1
+                for higher in range(level, 0, -1):
+                    self.cascade(higher)
+
+            index = tick % self.slots
+            if first[index]:
+                timers, first[index] = first[index], []
+                self.pending -= len(timers)
+                for _, callback in timers:
+                    callback()
+        self.current = max(self.current, now)
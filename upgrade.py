@@ -1,5 +1,6 @@
 import pygame
 from settings import *
+from renderer import get_renderer
 
 
 class Upgrade:
@@ -13,11 +14,11 @@ class Upgrade:
     def __init__(self, player):
         """
         This method initializes an Upgrade object.
-        It gets the display surface, sets the font, and sets up the upgrade items.
+        It gets the HUD surface, sets the font, and sets up the upgrade items.
 
         :param player: The player object.
         """
-        self.display_surface = pygame.display.get_surface()
+        self.display_surface = get_renderer().surface
         self.player = player
         self.attribute_nr = len(player.stats)
         self.attribute_names = list(player.stats.keys())
@@ -29,47 +30,24 @@ class Upgrade:
         self.create_items()
 
         self.selection_index = 0
-        self.selection_time = None
-        self.can_move = True
 
-    def input(self):
+    def handle_event(self, event):
         """
-        This method handles player input for the upgrade system.
-        It checks if the arrow keys are pressed and updates the selection index accordingly.
-        It also checks if the space key is pressed and triggers the selected upgrade.
-        """
-        keys = pygame.key.get_pressed()
-
-        if self.can_move:
-            if keys[pygame.K_RIGHT] and self.selection_index < self.attribute_nr - 1:
-                self.selection_index += 1
-                self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
-            elif keys[pygame.K_LEFT] and self.selection_index >= 1:
-                self.selection_index -= 1
-                self.can_move = False
-                self.selection_time = pygame.time.get_ticks()
+        This method handles a key press in the upgrade menu.
+        The arrow keys move the selection and the space key triggers the selected upgrade.
 
-        space_pressed = keys[pygame.K_SPACE]
+        :param event: The event to handle.
+        """
+        if event.type != pygame.KEYDOWN:
+            return
 
-        if space_pressed and not self.prev_space_pressed:
-            self.can_move = False
-            self.selection_time = pygame.time.get_ticks()
+        if event.key == pygame.K_RIGHT and self.selection_index < self.attribute_nr - 1:
+            self.selection_index += 1
+        elif event.key == pygame.K_LEFT and self.selection_index >= 1:
+            self.selection_index -= 1
+        elif event.key == pygame.K_SPACE:
             self.item_list[self.selection_index].trigger(self.player)
 
-        self.prev_space_pressed = space_pressed
-        self.selection_cooldown()
-
-    def selection_cooldown(self):
-        """
-        This method handles the selection cooldown.
-        If the player cannot move, it checks if the cooldown has passed and allows the player to move.
-        """
-        if not self.can_move:
-            current_time = pygame.time.get_ticks()
-            if current_time - self.selection_time >= 300:
-                self.can_move = True
-
     def create_items(self):
         """
         This method creates the upgrade items.
@@ -91,12 +69,8 @@ class Upgrade:
 
     def display(self):
         """
-        This method displays the upgrade system.
-        It handles player input, displays the upgrade items, and handles the selection cooldown.
+        This method displays the upgrade system. The input is handled by handle_event.
         """
-        self.input()
-        self.selection_cooldown()
-
         for index, item in enumerate(self.item_list):
             name = self.attribute_names[index]
             value = self.player.get_value_by_index(index)
@@ -182,11 +156,7 @@ class Item:
 
         :param player: The player object.
         """
-        upgrade_atrtibute = list(player.stats.keys())[self.index]
-        player.stats[upgrade_atrtibute] *= 1.2
-        if player.stats[upgrade_atrtibute] > player.max_stats[upgrade_atrtibute]:
-            player.stats[upgrade_atrtibute] = player.max_stats[upgrade_atrtibute]
-        player.upgrade_performed = True
+        player.upgrade(self.index)
 
     def display_names(self, surface, name, selected):
         """
@@ -0,0 +1,156 @@
+import pygame
+from random import Random
+from settings import *
+
+
+class WaveManager:
+    """
+    The WaveManager class keeps track of the waves of enemies. It counts the live enemies of every type,
+    decides which enemies to spawn and tells its listeners when a wave has been cleared.
+    In streaming mode, used by the endless mode, enemies keep spawning up to a population cap
+    and a wave counts as cleared once enough enemies have been killed.
+
+    :param streaming: Whether the enemies spawn continuously instead of in waves.
+    :param population_cap: The maximum number of live enemies in streaming mode.
+    :param random: The random generator picking the enemy types.
+    """
+
+    def __init__(self, streaming=ENDLESS_MODE, population_cap=POPULATION_CAP, random=None):
+        """
+        This method initializes a WaveManager object. It sets up the level, the wave size, the enemy counters
+        and the listeners.
+
+        :param streaming: Whether the enemies spawn continuously instead of in waves.
+        :param population_cap: The maximum number of live enemies in streaming mode.
+        :param random: The random generator picking the enemy types, a new one by default.
+        """
+        self.random = random or Random()
+        self.level = 0
+        self.wave_size = 0
+        self.streaming = streaming
+        self.population_cap = population_cap
+
+        # enemy counters
+        self.alive = dict.fromkeys(enemy_data, 0)
+        self.total_alive = 0
+        self.kills = 0
+
+        self.listeners = []
+
+    def add_listener(self, callback):
+        """
+        This method adds a function to call when a wave is cleared.
+
+        :param callback: The function to call, it gets the cleared level.
+        """
+        self.listeners.append(callback)
+
+    def pick_enemies(self, amount):
+        """
+        This method picks random enemy types.
+
+        :param amount: The number of enemies to pick.
+        :return: A list of enemy names.
+        """
+        names = list(enemy_data.keys())
+        return [self.random.choice(names) for _ in range(amount)]
+
+    def next_wave(self):
+        """
+        This method starts the next wave. It increases the level and the wave size.
+
+        :return: A list with the names of the enemies of the wave.
+        """
+        self.level += 1
+        self.wave_size += WAVE_GROWTH
+        self.kills = 0
+        return self.pick_enemies(self.wave_size)
+
+    def update(self):
+        """
+        This method decides which enemies to spawn this frame. In wave mode, the next wave is spawned
+        once no enemy is alive. In streaming mode, enemies are topped up towards the population cap.
+
+        :return: A list with the names of the enemies to spawn.
+        """
+        if self.streaming:
+            if self.level == 0:
+                self.next_wave()
+            room = self.population_cap - self.total_alive
+            return self.pick_enemies(max(0, min(room, STREAM_SPAWN_RATE)))
+        if self.total_alive == 0:
+            return self.next_wave()
+        return []
+
+    def register_spawn(self, enemy_name):
+        """
+        This method counts a spawned enemy.
+
+        :param enemy_name: The name of the enemy.
+        """
+        self.alive[enemy_name] += 1
+        self.total_alive += 1
+
+    def register_kill(self, enemy_name):
+        """
+        This method counts a killed enemy. If it ends the wave, the listeners are told.
+
+        :param enemy_name: The name of the enemy.
+        """
+        self.alive[enemy_name] -= 1
+        self.total_alive -= 1
+        self.kills += 1
+
+        if self.streaming:
+            if self.kills >= self.wave_size:
+                cleared_level = self.level
+                self.next_wave()
+                self.wave_cleared(cleared_level)
+        elif self.total_alive == 0:
+            self.wave_cleared(self.level)
+
+    def wave_cleared(self, level):
+        """
+        This method tells every listener that a wave has been cleared.
+
+        :param level: The level of the cleared wave.
+        """
+        for callback in self.listeners:
+            callback(level)
+
+
+class EnemyGroup(pygame.sprite.Group):
+    """
+    The EnemyGroup class is a sprite group that reports the enemies added to and removed from it
+    to a WaveManager, so killing an enemy updates the wave counters in constant time.
+
+    :param wave_manager: The WaveManager counting the enemies.
+    """
+
+    def __init__(self, wave_manager):
+        """
+        This method initializes an EnemyGroup object.
+
+        :param wave_manager: The WaveManager counting the enemies.
+        """
+        super().__init__()
+        self.wave_manager = wave_manager
+
+    def add_internal(self, sprite, layer=None):
+        """
+        This method adds an enemy to the group and counts it as spawned.
+
+        :param sprite: The enemy.
+        :param layer: Unused, kept for the signature of pygame.sprite.Group.
+        """
+        super().add_internal(sprite, layer)
+        self.wave_manager.register_spawn(sprite.enemy_name)
+
+    def remove_internal(self, sprite):
+        """
+        This method removes an enemy from the group and counts it as killed.
+
+        :param sprite: The enemy.
+        """
+        super().remove_internal(sprite)
+        self.wave_manager.register_kill(sprite.enemy_name)
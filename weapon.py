@@ -1,4 +1,22 @@
+from weakref import WeakKeyDictionary
 import pygame
+from assets import preloader
+from hitmasks import get_mask
+
+# mirrored copies of the weapon images, made once per image
+flipped_images = WeakKeyDictionary()
+
+
+def flip(image):
+    """
+    This function gets the horizontally mirrored copy of a weapon image, mirroring it the first time.
+
+    :param image: The weapon image.
+    :return: The mirrored image.
+    """
+    if image not in flipped_images:
+        flipped_images[image] = pygame.transform.flip(image, True, False)
+    return flipped_images[image]
 
 
 class Weapon(pygame.sprite.Sprite):
@@ -13,7 +31,7 @@ class Weapon(pygame.sprite.Sprite):
     def __init__(self, player, groups):
         """
         This method initializes a Weapon object. It calls the superclass' __init__ method and sets up the sprite type,
-        image, and rect based on the player's status.
+        image, mask, and rect based on the player's status.
 
         :param player: The player object.
         :param groups: The groups that the weapon belongs to.
@@ -23,7 +41,8 @@ class Weapon(pygame.sprite.Sprite):
         direction = player.status.split('_')[0]
 
         full_path = f'graphics/weapons/{player.weapon}/{direction}.png'
-        self.image = pygame.image.load(full_path).convert_alpha()
+        self.image = preloader.image(full_path)
+        self.mask = get_mask(self.image)
 
         if direction == 'right':
             self.rect = self.image.get_rect(midleft=player.rect.midright + pygame.math.Vector2(0, 16))
@@ -47,7 +66,8 @@ class Weapon(pygame.sprite.Sprite):
         opposite_weapon = Weapon(player, groups)
 
         # Flip the image horizontally
-        opposite_weapon.image = pygame.transform.flip(self.image, True, False)
+        opposite_weapon.image = flip(self.image)
+        opposite_weapon.mask = get_mask(opposite_weapon.image)
 
         # Update the rect position based on the mirrored direction
         opposite_weapon.rect = self.rect.copy()
@@ -0,0 +1,309 @@
+from collections import OrderedDict
+import pygame
+from settings import *
+from tile import Tile
+
+
+class MapLayer:
+    """
+    The MapLayer class reads a CSV layer of the map a few rows at a time, without keeping the layer in memory.
+    The file is scanned once for the byte offset of every row, so any block of rows can be read with a seek.
+
+    :param path: The path to the CSV file.
+    """
+
+    def __init__(self, path):
+        """
+        This method initializes a MapLayer object. It indexes the rows of the file and counts its columns.
+
+        :param path: The path to the CSV file.
+        """
+        self.path = path
+        self.offsets = []
+        self.columns = 0
+        with open(path, 'rb') as file:
+            offset = 0
+            for line in file:
+                if not self.offsets:
+                    self.columns = len(line.split(b','))
+                self.offsets.append(offset)
+                offset += len(line)
+        self.rows = len(self.offsets)
+
+    def read(self, first_row=0, last_row=None, first_column=0, last_column=None):
+        """
+        This method reads a block of the layer, row by row.
+
+        :param first_row: The index of the first row.
+        :param last_row: The index after the last row, by default the end of the layer.
+        :param first_column: The index of the first column.
+        :param last_column: The index after the last column, by default the end of the rows.
+        :return: A generator of (row index, list of cells) pairs.
+        """
+        last_row = self.rows if last_row is None else min(last_row, self.rows)
+        if first_row >= last_row:
+            return
+        with open(self.path) as file:
+            file.seek(self.offsets[first_row])
+            for row_index in range(first_row, last_row):
+                yield row_index, file.readline().rstrip('\n').split(',')[first_column:last_column]
+
+    def cells(self, chunk, chunk_size):
+        """
+        This method reads the filled cells of a chunk of the layer.
+
+        :param chunk: The (column, row) index of the chunk.
+        :param chunk_size: The width and height of a chunk in tiles.
+        :return: A generator of (position in pixels, cell) pairs.
+        """
+        first_column = chunk[0] * chunk_size
+        first_row = chunk[1] * chunk_size
+        for row_index, row in self.read(first_row, first_row + chunk_size, first_column, first_column + chunk_size):
+            for column_index, column in enumerate(row, first_column):
+                if column != '-1':
+                    yield (column_index * TILESIZE, row_index * TILESIZE), column
+
+
+class World:
+    """
+    The World class streams the map in square chunks of tiles around the player. Only the resident chunks have
+    tiles, so only they are drawn, collided with and spawned in. The chunks the view needs are built right away,
+    the chunks ahead of the player's movement are prefetched a few per frame, and once more chunks are resident
+    than the budget allows, the least recently needed ones are evicted.
+    The food is sparse, so its state is kept for the whole map, and eaten food does not come back
+    when its chunk is built again.
+
+    :param visible_sprites: The group of the drawn sprites.
+    :param obstacles: The CollisionGrid the characters collide with.
+    :param static_sprites: The group of the sprites that are never updated.
+    :param create_food: The function to call to create a food tile, given its position and image.
+    :param object_images: The images of the objects.
+    :param food_images: The images of the food.
+    :param random: The random generator picking the food images.
+    :param chunk_size: The width and height of a chunk in tiles.
+    :param budget: The maximum number of resident chunks, unless the view needs more.
+    """
+
+    def __init__(self, visible_sprites, obstacles, static_sprites, create_food, object_images, food_images,
+                 random, chunk_size=CHUNK_SIZE, budget=CHUNK_BUDGET):
+        """
+        This method initializes a World object. It indexes the streamed layers and reads the sparse ones,
+        the food and the entities, once. No chunk is resident yet.
+
+        :param visible_sprites: The group of the drawn sprites.
+        :param obstacles: The CollisionGrid the characters collide with.
+        :param static_sprites: The group of the sprites that are never updated.
+        :param create_food: The function to call to create a food tile, given its position and image.
+        :param object_images: The images of the objects.
+        :param food_images: The images of the food.
+        :param random: The random generator picking the food images.
+        :param chunk_size: The width and height of a chunk in tiles.
+        :param budget: The maximum number of resident chunks, unless the view needs more.
+        """
+        self.visible_sprites = visible_sprites
+        self.obstacles = obstacles
+        self.static_sprites = static_sprites
+        self.create_food = create_food
+        self.object_images = object_images
+        self.food_images = food_images
+        self.chunk_size = chunk_size
+        self.chunk_pixels = chunk_size * TILESIZE
+        self.budget = budget
+
+        # streamed layers
+        self.boundary = MapLayer('map/map2_FloorBlocks.csv')
+        self.objects = MapLayer('map/map2_Objects.csv')
+        self.rect = pygame.Rect(0, 0, self.boundary.columns * TILESIZE, self.boundary.rows * TILESIZE)
+
+        # sparse layers
+        self.food = {}  # chunk -> {position: image index}
+        for row_index, row in MapLayer('map/map2_Food.csv').read():
+            for column_index, column in enumerate(row):
+                if column != '-1':
+                    pos = (column_index * TILESIZE, row_index * TILESIZE)
+                    image_index = random.randrange(len(food_images))
+                    self.food.setdefault(self.chunk_of(pos), {})[pos] = image_index
+        self.entities = {}  # entity id -> positions
+        for row_index, row in MapLayer('map/map2_Entities.csv').read():
+            for column_index, column in enumerate(row):
+                if column != '-1':
+                    self.entities.setdefault(column, []).append((column_index * TILESIZE, row_index * TILESIZE))
+
+        # resident chunks, from the least to the most recently needed
+        self.resident = OrderedDict()  # chunk -> tiles
+        self.food_tiles = {}  # position -> food tile of a resident chunk
+
+    def __len__(self):
+        """
+        This method gets the number of resident chunks.
+
+        :return: The number of resident chunks.
+        """
+        return len(self.resident)
+
+    def chunk_of(self, pos):
+        """
+        This method gets the chunk a position is in.
+
+        :param pos: The position in pixels.
+        :return: The (column, row) index of the chunk.
+        """
+        return int(pos[0] // self.chunk_pixels), int(pos[1] // self.chunk_pixels)
+
+    def chunk_rect(self, chunk):
+        """
+        This method gets the area of a chunk.
+
+        :param chunk: The (column, row) index of the chunk.
+        :return: The rect of the chunk in pixels, clipped to the map.
+        """
+        return pygame.Rect(chunk[0] * self.chunk_pixels, chunk[1] * self.chunk_pixels,
+                           self.chunk_pixels, self.chunk_pixels).clip(self.rect)
+
+    def chunks_in(self, rect):
+        """
+        This method gets the chunks overlapping an area.
+
+        :param rect: The area in pixels.
+        :return: A list of (column, row) indices, row by row.
+        """
+        rect = rect.clip(self.rect)
+        if not rect.width or not rect.height:
+            return []
+        left, top = self.chunk_of(rect.topleft)
+        right, bottom = self.chunk_of((rect.right - 1, rect.bottom - 1))
+        return [(x, y) for y in range(top, bottom + 1) for x in range(left, right + 1)]
+
+    def is_resident(self, pos):
+        """
+        This method checks whether the chunk of a position is resident.
+
+        :param pos: The position in pixels.
+        :return: Whether the chunk is resident.
+        """
+        return self.chunk_of(pos) in self.resident
+
+    def update(self, center, direction):
+        """
+        This method streams the chunks around a point. The chunks overlapping the view moved ahead
+        in the direction of movement are prefetched, a few per call, then the chunks overlapping the view
+        and its margin are built right away and marked as the most recently needed.
+        Chunks beyond the budget are evicted, the least recently needed first, but never the needed ones.
+
+        :param center: The center of the view in pixels.
+        :param direction: The direction of movement.
+        """
+        view = pygame.Rect(0, 0, WIDTH, HEIGHT)
+        view.center = (int(center[0]), int(center[1]))
+
+        needed = self.chunks_in(view.inflate(CHUNK_MARGIN * 2, CHUNK_MARGIN * 2))
+
+        if direction.x or direction.y:
+            ahead = view.move(round(direction.x * CHUNK_PREFETCH_DISTANCE),
+                              round(direction.y * CHUNK_PREFETCH_DISTANCE))
+            loads = 0
+            for chunk in self.chunks_in(ahead):
+                if chunk in self.resident:
+                    self.resident.move_to_end(chunk)
+                elif loads < CHUNK_PREFETCH_LOADS:
+                    self.load(chunk)
+                    loads += 1
+
+        for chunk in needed:
+            if chunk in self.resident:
+                self.resident.move_to_end(chunk)
+            else:
+                self.load(chunk)
+
+        needed = set(needed)
+        for chunk in list(self.resident):
+            if len(self.resident) <= self.budget:
+                break
+            if chunk not in needed:
+                self.unload(chunk)
+
+    def load(self, chunk):
+        """
+        This method builds the tiles of a chunk: the invisible boundaries, the objects and the remaining food.
+        The boundaries and the objects are added to the collision grid.
+
+        :param chunk: The (column, row) index of the chunk.
+        """
+        tiles = [Tile(pos, [], 'invisible') for pos, _ in self.boundary.cells(chunk, self.chunk_size)]
+        tiles += [Tile(pos, [self.visible_sprites, self.static_sprites], 'object', self.object_images[int(column)])
+                  for pos, column in self.objects.cells(chunk, self.chunk_size)]
+        for tile in tiles:
+            self.obstacles.add(tile)
+        for pos, image_index in self.food.get(chunk, {}).items():
+            self.food_tiles[pos] = self.create_food(pos, self.food_images[image_index])
+
+        self.resident[chunk] = tiles
+
+    def unload(self, chunk):
+        """
+        This method evicts a chunk and removes its tiles from every group and from the collision grid.
+
+        :param chunk: The (column, row) index of the chunk.
+        """
+        for tile in self.resident.pop(chunk):
+            self.obstacles.remove(tile)
+            tile.kill()
+        for pos in self.food.get(chunk, {}):
+            tile = self.food_tiles.pop(pos, None)
+            if tile:
+                tile.kill()
+
+    def spawn_position(self, random, area):
+        """
+        This method picks a random position in an area. If its chunk is not resident, another position is picked
+        in a resident chunk overlapping the area, so spawned characters always collide with the map.
+        When no resident chunk overlaps the area, the first position is kept.
+
+        :param random: The random generator.
+        :param area: The area in pixels.
+        :return: The position.
+        """
+        pos = (random.randint(area.left, area.right), random.randint(area.top, area.bottom))
+        if self.is_resident(pos):
+            return pos
+        choices = [self.chunk_rect(chunk).clip(area) for chunk in self.resident]
+        choices = [rect for rect in choices if rect.width and rect.height]
+        if not choices:
+            return pos
+        rect = random.choice(choices)
+        return random.randint(rect.left, rect.right - 1), random.randint(rect.top, rect.bottom - 1)
+
+    def eat_food(self, tile):
+        """
+        This method removes a food tile for good, so it does not come back when its chunk is built again.
+
+        :param tile: The food tile.
+        """
+        pos = tile.rect.topleft
+        self.food.get(self.chunk_of(pos), {}).pop(pos, None)
+        self.food_tiles.pop(pos, None)
+        tile.kill()
+
+    def food_items(self):
+        """
+        This method gets the remaining food of the whole map.
+
+        :return: A list of (image index, position) pairs.
+        """
+        return [(image_index, pos) for food in self.food.values() for pos, image_index in food.items()]
+
+    def set_food(self, items):
+        """
+        This method replaces the remaining food of the whole map and rebuilds the food tiles of the resident chunks.
+
+        :param items: The (image index, position) pairs of the food.
+        """
+        for tile in self.food_tiles.values():
+            tile.kill()
+        self.food_tiles = {}
+        self.food = {}
+        for image_index, pos in items:
+            self.food.setdefault(self.chunk_of(pos), {})[pos] = image_index
+        for chunk in self.resident:
+            for pos, image_index in self.food.get(chunk, {}).items():
+                self.food_tiles[pos] = self.create_food(pos, self.food_images[image_index])